@@ -8,27 +8,45 @@ Triggers via WASM modules or shell scripts.
 import json
 import re
 import hashlib
-import uuid
+import os
+import time
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, fields
+
+from json_io import write_json_file
 
 OUTPUT_DIR = Path(__file__).parent / "output"
 GLAF_DIR = OUTPUT_DIR / "glaf"
 OSINT_README = OUTPUT_DIR / "threat_content" / "awesome-osint" / "README.md"
 
+# 1MB write buffer for the (potentially multi-MB) export files
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Quote escaping for Cypher string literals
+_CYPHER_ESC = str.maketrans({'"': '\\"', "'": "\\'"})
+
+# Category slugs and script/module file names
+_SLUG_TBL = str.maketrans({' ': '-', '/': '-'})
+_SNAKE_TBL = str.maketrans({' ': '_'})
+
 
 def generate_sch(content: str) -> str:
     """Generate 16-char Semantic Convergent Hash."""
-    h = hashlib.sha256(content.encode()).hexdigest()[:16]
-    return h
+    return hashlib.sha256(content.encode()).digest()[:8].hex()
+
+
+def _rand_hex(n: int) -> str:
+    """Return 2*n random hex chars straight from the OS RNG."""
+    return os.urandom(n).hex()
 
 
 def generate_cuid() -> str:
     """Generate 16-char Contextual Unique ID."""
-    ts = hex(int(datetime.now().timestamp() * 1000))[2:][:10]
-    rand = uuid.uuid4().hex[:6]
+    ts = hex(int(time.time() * 1000))[2:][:10]
+    rand = _rand_hex(3)
     return f"{ts}{rand}"
 
 
@@ -36,11 +54,13 @@ def generate_trivariate(content: str) -> str:
     """Generate full trivariate hash: SCH-CUID-UUID."""
     sch = generate_sch(content)
     cuid = generate_cuid()
-    uid = str(uuid.uuid4())
+    # UUIDv4 layout (version/variant nibbles set) without building a uuid.UUID
+    b = _rand_hex(16)
+    uid = f"{b[:8]}-{b[8:12]}-4{b[13:16]}-{'89ab'[int(b[16], 16) & 3]}{b[17:20]}-{b[20:32]}"
     return f"triv:{sch}_{cuid}_{uid}"
 
 
-@dataclass
+@dataclass(slots=True)
 class OSINTTool:
     """OSINT tool/resource with GLAF attributes."""
     name: str
@@ -62,20 +82,18 @@ class OSINTTool:
     api_endpoint: Optional[str] = None
 
     # MITRE mappings
-    mitre_techniques: List[str] = None
-    d3fend_techniques: List[str] = None
+    mitre_techniques: List[str] = field(default_factory=list)
+    d3fend_techniques: List[str] = field(default_factory=list)
 
     def __post_init__(self):
-        self.mitre_techniques = self.mitre_techniques or []
-        self.d3fend_techniques = self.d3fend_techniques or []
         if not self.triv_hash:
             self.triv_hash = generate_trivariate(f"{self.name}:{self.url}")
         if not self.genome:
             # 48-char genome fingerprint
-            self.genome = hashlib.sha384(f"{self.name}:{self.category}:{self.url}".encode()).hexdigest()[:48]
+            self.genome = hashlib.sha384(f"{self.name}:{self.category}:{self.url}".encode()).digest()[:24].hex()
 
 
-@dataclass
+@dataclass(slots=True)
 class OSINTCategory:
     """OSINT category node."""
     name: str
@@ -89,7 +107,17 @@ class OSINTCategory:
         if not self.triv_hash:
             self.triv_hash = generate_trivariate(f"category:{self.slug}")
         if not self.genome:
-            self.genome = hashlib.sha384(f"osint_category:{self.slug}".encode()).hexdigest()[:48]
+            self.genome = hashlib.sha384(f"osint_category:{self.slug}".encode()).digest()[:24].hex()
+
+
+# Field names for shallow (non-copying) serialization
+_TOOL_FIELDS = tuple(f.name for f in fields(OSINTTool))
+_CATEGORY_FIELDS = tuple(f.name for f in fields(OSINTCategory))
+
+
+def _shallow_dict(obj, names: Tuple[str, ...]) -> Dict:
+    """Shallow field dict; unlike asdict() it does not deep-copy lists."""
+    return {n: getattr(obj, n) for n in names}
 
 
 # OSINT category to MITRE ATT&CK technique mappings
@@ -127,34 +155,71 @@ CATEGORY_D3FEND_MAP = {
 }
 
 # Action type inference based on tool characteristics
+# CLI tools (can be scripted)
+CLI_TOOLS = ["nmap", "shodan", "amass", "subfinder", "theharvester", "recon-ng",
+             "maltego", "spiderfoot", "theHarvester", "dnsenum", "dnsrecon",
+             "whois", "dig", "host", "traceroute", "curl", "wget"]
+
+# WASM candidates (browser-based that could be wrapped)
+WASM_CANDIDATES = ["search", "lookup", "check", "scan", "analyze"]
+
+_CLI_RE = re.compile('|'.join(map(re.escape, CLI_TOOLS)))
+_WASM_RE = re.compile('|'.join(map(re.escape, WASM_CANDIDATES)))
+
+
 def infer_action_type(name: str, url: str, description: str) -> Tuple[str, Optional[str]]:
     """Infer action type and script/wasm path."""
     name_lower = name.lower()
     desc_lower = description.lower()
 
-    # CLI tools (can be scripted)
-    cli_tools = ["nmap", "shodan", "amass", "subfinder", "theharvester", "recon-ng",
-                 "maltego", "spiderfoot", "theHarvester", "dnsenum", "dnsrecon",
-                 "whois", "dig", "host", "traceroute", "curl", "wget"]
-
-    for tool in cli_tools:
-        if tool in name_lower:
-            return "cli", f"scripts/osint/{name_lower.replace(' ', '_')}.sh"
+    if _CLI_RE.search(name_lower):
+        return "cli", f"scripts/osint/{name_lower.translate(_SNAKE_TBL)}.sh"
 
     # API-based tools
     if "api" in desc_lower or ".io" in url or "api." in url:
         return "api", None
 
-    # WASM candidates (browser-based that could be wrapped)
-    wasm_candidates = ["search", "lookup", "check", "scan", "analyze"]
-    for candidate in wasm_candidates:
-        if candidate in desc_lower:
-            return "wasm", f"wasm/osint/{name_lower.replace(' ', '_')}.wasm"
+    if _WASM_RE.search(desc_lower):
+        return "wasm", f"wasm/osint/{name_lower.translate(_SNAKE_TBL)}.wasm"
 
     # Default to web
     return "web", None
 
 
+def _tool_cypher(i: int, tool: OSINTTool) -> str:
+    """Render a single OSINTTool CREATE statement."""
+    # Escape quotes in strings
+    name_esc = tool.name.translate(_CYPHER_ESC)
+    desc_esc = tool.description.translate(_CYPHER_ESC)[:500]
+    url_esc = tool.url.replace('"', '\\"')
+
+    optional = "".join([
+        f'  action_script: "{tool.action_script}",\n' if tool.action_script else '',
+        f'  action_wasm: "{tool.action_wasm}",\n' if tool.action_wasm else '',
+        f'  api_endpoint: "{tool.api_endpoint}",\n' if tool.api_endpoint else '',
+        f'  mitre_techniques: {json.dumps(tool.mitre_techniques)},\n' if tool.mitre_techniques else '',
+        f'  d3fend_techniques: {json.dumps(tool.d3fend_techniques)},\n' if tool.d3fend_techniques else '',
+    ])
+    subcategory = f'  subcategory: "{tool.subcategory}",\n' if tool.subcategory else ''
+
+    return (
+        f'CREATE (t{i}:OSINTTool {{\n'
+        f'  triv_hash: "{tool.triv_hash}",\n'
+        f'  genome: "{tool.genome}",\n'
+        f'  name: "{name_esc}",\n'
+        f'  url: "{url_esc}",\n'
+        f'  description: "{desc_esc}",\n'
+        f'  category: "{tool.category}",\n'
+        f'{subcategory}'
+        f'  hd4: "{tool.hd4}",\n'
+        f'  risk: {tool.risk},\n'
+        f'  action_type: "{tool.action_type}",\n'
+        f'{optional}'
+        f'  actionable: true\n'
+        f'}});\n'
+    )
+
+
 class ATLOSINTExporter:
     """Export Awesome OSINT to GLAF format."""
 
@@ -163,6 +228,7 @@ class ATLOSINTExporter:
         self.categories: Dict[str, OSINTCategory] = {}
         self.current_category = None
         self.current_subcategory = None
+        self._cat_counts: Counter = Counter()
 
     def parse_readme(self, filepath: Path) -> int:
         """Parse Awesome OSINT README.md."""
@@ -179,11 +245,16 @@ class ATLOSINTExporter:
         tool_pattern = re.compile(r'^\* \[([^\]]+)\]\(([^)]+)\)\s*-?\s*(.*)$')
 
         for line in lines:
+            # Classify on the literal line prefix first; the capture regexes
+            # only run on lines that can actually match them.
+            if not line or line[0] not in '#*':
+                continue
+
             # Check for category header
-            cat_match = category_pattern.match(line)
+            cat_match = category_pattern.match(line) if line.startswith('## [') else None
             if cat_match:
                 cat_name = cat_match.group(1).strip()
-                slug = cat_name.lower().replace(' ', '-').replace('/', '-')
+                slug = cat_name.lower().translate(_SLUG_TBL)
                 self.current_category = slug
                 self.current_subcategory = None
 
@@ -195,13 +266,13 @@ class ATLOSINTExporter:
                 continue
 
             # Check for subcategory
-            sub_match = subcategory_pattern.match(line)
+            sub_match = subcategory_pattern.match(line) if line.startswith('### ') else None
             if sub_match and self.current_category:
                 self.current_subcategory = sub_match.group(1).strip()
                 continue
 
             # Check for tool entry
-            tool_match = tool_pattern.match(line)
+            tool_match = tool_pattern.match(line) if line.startswith('* [') else None
             if tool_match and self.current_category:
                 name = tool_match.group(1).strip()
                 url = tool_match.group(2).strip()
@@ -233,7 +304,10 @@ class ATLOSINTExporter:
                     tool.api_endpoint = url
 
                 self.tools.append(tool)
-                self.categories[self.current_category].tool_count += 1
+                self._cat_counts[self.current_category] += 1
+
+        for cat in self.categories.values():
+            cat.tool_count = self._cat_counts[cat.slug]
 
         print(f"  Parsed {len(self.tools)} tools in {len(self.categories)} categories")
         return len(self.tools)
@@ -242,102 +316,82 @@ class ATLOSINTExporter:
         """Export to Cypher++ for GLAF."""
         print(f"Exporting Cypher to {filepath}...")
 
-        with open(filepath, 'w') as f:
-            # Header
-            f.write("// ATL-OSINT Graph Layer\n")
-            f.write("// Generated: {}\n".format(datetime.now().isoformat()))
-            f.write("// Tools: {}, Categories: {}\n\n".format(len(self.tools), len(self.categories)))
-
-            # Schema constraints
-            f.write("// === SCHEMA ===\n")
-            f.write("CREATE CONSTRAINT osint_tool_triv IF NOT EXISTS FOR (t:OSINTTool) REQUIRE t.triv_hash IS UNIQUE;\n")
-            f.write("CREATE CONSTRAINT osint_cat_triv IF NOT EXISTS FOR (c:OSINTCategory) REQUIRE c.triv_hash IS UNIQUE;\n")
-            f.write("CREATE INDEX osint_tool_name IF NOT EXISTS FOR (t:OSINTTool) ON (t.name);\n")
-            f.write("CREATE INDEX osint_tool_action IF NOT EXISTS FOR (t:OSINTTool) ON (t.action_type);\n\n")
-
-            # Root node for ATL-OSINT layer
-            root_triv = generate_trivariate("atl-osint-root")
-            root_genome = hashlib.sha384(b"atl-osint-root-layer").hexdigest()[:48]
-            f.write("// === ATL-OSINT ROOT ===\n")
-            f.write(f'CREATE (root:ATLLayer:OSINTRoot {{\n')
-            f.write(f'  triv_hash: "{root_triv}",\n')
-            f.write(f'  genome: "{root_genome}",\n')
-            f.write(f'  name: "ATL-OSINT",\n')
-            f.write(f'  description: "Attack Threat Library - OSINT Operations",\n')
-            f.write(f'  hd4: "Hunt",\n')
-            f.write(f'  tool_count: {len(self.tools)},\n')
-            f.write(f'  category_count: {len(self.categories)},\n')
-            f.write(f'  layer_type: "actionable",\n')
-            f.write(f'  trigger_types: ["web", "api", "cli", "wasm"]\n')
-            f.write(f'}});\n\n')
-
-            # Category nodes
-            f.write("// === CATEGORIES ===\n")
-            for cat in self.categories.values():
-                f.write(f'CREATE (c_{cat.slug.replace("-", "_")}:OSINTCategory {{\n')
-                f.write(f'  triv_hash: "{cat.triv_hash}",\n')
-                f.write(f'  genome: "{cat.genome}",\n')
-                f.write(f'  name: "{cat.name}",\n')
-                f.write(f'  slug: "{cat.slug}",\n')
-                f.write(f'  hd4: "{cat.hd4}",\n')
-                f.write(f'  tool_count: {cat.tool_count}\n')
-                f.write(f'}});\n')
-            f.write('\n')
-
-            # Category -> Root relationships
-            f.write("// === CATEGORY RELATIONSHIPS ===\n")
-            for cat in self.categories.values():
-                f.write(f'MATCH (root:OSINTRoot), (c:OSINTCategory {{slug: "{cat.slug}"}})\n')
-                f.write(f'CREATE (root)-[:HAS_CATEGORY]->(c);\n')
-            f.write('\n')
-
-            # Tool nodes
-            f.write("// === TOOLS ===\n")
-            for i, tool in enumerate(self.tools):
-                # Escape quotes in strings
-                name_esc = tool.name.replace('"', '\\"').replace("'", "\\'")
-                desc_esc = tool.description.replace('"', '\\"').replace("'", "\\'")[:500]
-                url_esc = tool.url.replace('"', '\\"')
-
-                f.write(f'CREATE (t{i}:OSINTTool {{\n')
-                f.write(f'  triv_hash: "{tool.triv_hash}",\n')
-                f.write(f'  genome: "{tool.genome}",\n')
-                f.write(f'  name: "{name_esc}",\n')
-                f.write(f'  url: "{url_esc}",\n')
-                f.write(f'  description: "{desc_esc}",\n')
-                f.write(f'  category: "{tool.category}",\n')
-                if tool.subcategory:
-                    f.write(f'  subcategory: "{tool.subcategory}",\n')
-                f.write(f'  hd4: "{tool.hd4}",\n')
-                f.write(f'  risk: {tool.risk},\n')
-                f.write(f'  action_type: "{tool.action_type}",\n')
-                if tool.action_script:
-                    f.write(f'  action_script: "{tool.action_script}",\n')
-                if tool.action_wasm:
-                    f.write(f'  action_wasm: "{tool.action_wasm}",\n')
-                if tool.api_endpoint:
-                    f.write(f'  api_endpoint: "{tool.api_endpoint}",\n')
-                if tool.mitre_techniques:
-                    f.write(f'  mitre_techniques: {json.dumps(tool.mitre_techniques)},\n')
-                if tool.d3fend_techniques:
-                    f.write(f'  d3fend_techniques: {json.dumps(tool.d3fend_techniques)},\n')
-                f.write(f'  actionable: true\n')
-                f.write(f'}});\n')
-            f.write('\n')
-
-            # Tool -> Category relationships
-            f.write("// === TOOL RELATIONSHIPS ===\n")
-            for i, tool in enumerate(self.tools):
-                f.write(f'MATCH (t:OSINTTool {{triv_hash: "{tool.triv_hash}"}}), ')
-                f.write(f'(c:OSINTCategory {{slug: "{tool.category}"}})\n')
-                f.write(f'CREATE (c)-[:HAS_TOOL]->(t);\n')
+        out: List[str] = []
+
+        # Header
+        out.append("// ATL-OSINT Graph Layer\n")
+        out.append("// Generated: {}\n".format(datetime.now().isoformat()))
+        out.append("// Tools: {}, Categories: {}\n\n".format(len(self.tools), len(self.categories)))
+
+        # Schema constraints
+        out.append("// === SCHEMA ===\n")
+        out.append("CREATE CONSTRAINT osint_tool_triv IF NOT EXISTS FOR (t:OSINTTool) REQUIRE t.triv_hash IS UNIQUE;\n")
+        out.append("CREATE CONSTRAINT osint_cat_triv IF NOT EXISTS FOR (c:OSINTCategory) REQUIRE c.triv_hash IS UNIQUE;\n")
+        out.append("CREATE INDEX osint_tool_name IF NOT EXISTS FOR (t:OSINTTool) ON (t.name);\n")
+        out.append("CREATE INDEX osint_tool_action IF NOT EXISTS FOR (t:OSINTTool) ON (t.action_type);\n\n")
+
+        # Root node for ATL-OSINT layer
+        root_triv = generate_trivariate("atl-osint-root")
+        root_genome = hashlib.sha384(b"atl-osint-root-layer").digest()[:24].hex()
+        out.append("// === ATL-OSINT ROOT ===\n")
+        out.append(f'CREATE (root:ATLLayer:OSINTRoot {{\n')
+        out.append(f'  triv_hash: "{root_triv}",\n')
+        out.append(f'  genome: "{root_genome}",\n')
+        out.append(f'  name: "ATL-OSINT",\n')
+        out.append(f'  description: "Attack Threat Library - OSINT Operations",\n')
+        out.append(f'  hd4: "Hunt",\n')
+        out.append(f'  tool_count: {len(self.tools)},\n')
+        out.append(f'  category_count: {len(self.categories)},\n')
+        out.append(f'  layer_type: "actionable",\n')
+        out.append(f'  trigger_types: ["web", "api", "cli", "wasm"]\n')
+        out.append(f'}});\n\n')
+
+        # Category nodes
+        out.append("// === CATEGORIES ===\n")
+        for cat in self.categories.values():
+            out.append(f'CREATE (c_{cat.slug.replace("-", "_")}:OSINTCategory {{\n')
+            out.append(f'  triv_hash: "{cat.triv_hash}",\n')
+            out.append(f'  genome: "{cat.genome}",\n')
+            out.append(f'  name: "{cat.name}",\n')
+            out.append(f'  slug: "{cat.slug}",\n')
+            out.append(f'  hd4: "{cat.hd4}",\n')
+            out.append(f'  tool_count: {cat.tool_count}\n')
+            out.append(f'}});\n')
+        out.append('\n')
+
+        # Category -> Root relationships
+        out.append("// === CATEGORY RELATIONSHIPS ===\n")
+        for cat in self.categories.values():
+            out.append(f'MATCH (root:OSINTRoot), (c:OSINTCategory {{slug: "{cat.slug}"}})\n')
+            out.append(f'CREATE (root)-[:HAS_CATEGORY]->(c);\n')
+        out.append('\n')
+
+        # Tool nodes
+        out.append("// === TOOLS ===\n")
+        out.extend(_tool_cypher(i, tool) for i, tool in enumerate(self.tools))
+        out.append('\n')
+
+        # Tool -> Category relationships
+        out.append("// === TOOL RELATIONSHIPS ===\n")
+        for i, tool in enumerate(self.tools):
+            out.append(f'MATCH (t:OSINTTool {{triv_hash: "{tool.triv_hash}"}}), ')
+            out.append(f'(c:OSINTCategory {{slug: "{tool.category}"}})\n')
+            out.append(f'CREATE (c)-[:HAS_TOOL]->(t);\n')
+
+        with open(filepath, 'w', buffering=WRITE_BUFFER_SIZE, encoding='utf-8') as f:
+            f.write("".join(out))
 
         print(f"  Wrote {len(self.tools)} tool nodes + {len(self.categories)} categories")
 
+    def action_type_counts(self) -> Counter:
+        """Tally tools per action type in a single pass."""
+        return Counter(t.action_type for t in self.tools)
+
     def export_json(self, filepath: Path):
         """Export to JSON for programmatic access."""
         print(f"Exporting JSON to {filepath}...")
 
+        counts = self.action_type_counts()
         data = {
             "layer": "ATL-OSINT",
             "version": "1.0.0",
@@ -346,18 +400,17 @@ class ATLOSINTExporter:
                 "total_tools": len(self.tools),
                 "total_categories": len(self.categories),
                 "action_types": {
-                    "web": len([t for t in self.tools if t.action_type == "web"]),
-                    "api": len([t for t in self.tools if t.action_type == "api"]),
-                    "cli": len([t for t in self.tools if t.action_type == "cli"]),
-                    "wasm": len([t for t in self.tools if t.action_type == "wasm"]),
+                    "web": counts["web"],
+                    "api": counts["api"],
+                    "cli": counts["cli"],
+                    "wasm": counts["wasm"],
                 }
             },
-            "categories": {cat.slug: asdict(cat) for cat in self.categories.values()},
-            "tools": [asdict(t) for t in self.tools],
+            "categories": {cat.slug: _shallow_dict(cat, _CATEGORY_FIELDS) for cat in self.categories.values()},
+            "tools": [_shallow_dict(t, _TOOL_FIELDS) for t in self.tools],
         }
 
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        write_json_file(filepath, data)
 
         print(f"  Wrote {len(self.tools)} tools to JSON")
 
@@ -404,8 +457,7 @@ class ATLOSINTExporter:
 
             actions["actions"].append(action)
 
-        with open(filepath, 'w') as f:
-            json.dump(actions, f, indent=2)
+        write_json_file(filepath, actions)
 
         print(f"  Wrote {len(actions['actions'])} action triggers")
 
@@ -438,9 +490,9 @@ def main():
     print(f"  Tools:      {len(exporter.tools)}")
     print(f"  Categories: {len(exporter.categories)}")
     print(f"  Action Types:")
+    counts = exporter.action_type_counts()
     for atype in ["web", "api", "cli", "wasm"]:
-        count = len([t for t in exporter.tools if t.action_type == atype])
-        print(f"    - {atype}: {count}")
+        print(f"    - {atype}: {counts[atype]}")
     print(f"\nOutputs:")
     print(f"  - {GLAF_DIR / 'atl_osint_graph.cypher'}")
     print(f"  - {GLAF_DIR / 'atl_osint_layer.json'}")
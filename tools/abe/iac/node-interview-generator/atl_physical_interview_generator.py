@@ -17,18 +17,35 @@ Ports: 7475 (browser), 7688 (bolt)
 
 Usage:
     python atl_physical_interview_generator.py --export-prompts  # Export for ABE batch
+        (writes system_prompt.txt + tasks.jsonl once; *_prompt.json hold task_id + user_prompt)
     python atl_physical_interview_generator.py --generate        # Generate with API
     python atl_physical_interview_generator.py --load-to-neo4j   # Store in Neo4j
+    python atl_physical_interview_generator.py --bulk-csv        # Cold-load via neo4j-admin import
     python atl_physical_interview_generator.py --stats           # Show statistics
 """
 
+import asyncio
+import atexit
+import csv
+import gzip
+import hashlib
 import json
 import os
+import shutil
+import subprocess
+import time
+import zlib
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
+from string import Template
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Tuple, TypedDict, Any
+
+from json_io import dumps_json_line, read_json_file, write_json_file
+from rate_limiter import AsyncRateLimiter
 
 try:
     from neo4j import GraphDatabase
@@ -36,6 +53,12 @@ try:
 except ImportError:
     HAS_NEO4J = False
 
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
 try:
     import google.generativeai as genai
     HAS_GENAI = True
@@ -49,11 +72,49 @@ logger = logging.getLogger(__name__)
 ATL_NEO4J_URI = "bolt://localhost:7688"
 ATL_NEO4J_USER = "neo4j"
 ATL_NEO4J_PASSWORD = "atl_physical_graph"
+NEO4J_POOL_SIZE = 50
 
 # Output paths
 OUTPUT_DIR = Path(__file__).parent / "output"
 ATL_INTERVIEWS_DIR = OUTPUT_DIR / "atl_physical_interviews"
 ATL_PROMPTS_DIR = OUTPUT_DIR / "atl_physical_prompts"
+LLM_CACHE_DIR = OUTPUT_DIR / "llm_cache"
+ATL_IMPORT_DIR = OUTPUT_DIR / "atl_physical_import"
+ATL_BLOBS_DIR = OUTPUT_DIR / "atl_physical_blobs"
+
+# Target database for neo4j-admin bulk import
+ATL_IMPORT_DATABASE = "neo4j"
+
+# Interviews written per Neo4j transaction (UNWIND batch) and parallel writers
+LOAD_BATCH_SIZE = 200
+LOAD_WRITER_THREADS = 8
+
+# Threads used to write prompt files in parallel
+PROMPT_WRITE_WORKERS = 16
+
+# Indicator ingest via apoc.periodic.iterate (falls back to a serial UNWIND)
+INDICATOR_INGEST_BATCH_SIZE = 1000
+INDICATOR_INGEST_CONCURRENCY = 8
+INDICATOR_INGEST_RETRIES = 3
+
+# Per-row indicator MERGE; r = {text, type, task_ids}. Rows whose interviews
+# are all missing are dropped so no Indicator is created without an edge
+_INDICATOR_MERGE_CYPHER = """
+    MATCH (i:ATLPhysical:Interview) WHERE i.task_id IN r.task_ids
+    WITH r, collect(i) AS interviews
+    WITH r, interviews WHERE size(interviews) > 0
+    MERGE (ind:ATLPhysical:Indicator {text: r.text, type: r.type})
+    FOREACH (i IN interviews | MERGE (i)-[:HAS_INDICATOR]->(ind))
+"""
+
+# Gemini generation: model, in-flight requests and request pacing
+GEMINI_MODEL = "gemini-2.0-flash-exp"
+GENERATION_TEMPERATURE = 0.7
+GENERATION_CONCURRENCY = 10
+GENERATION_RATE_PER_SEC = 5.0
+
+# Local response cache lifetime (unchanged tasks skip the API entirely)
+RESPONSE_CACHE_TTL_SECONDS = 30 * 86400
 
 # RFC-9025 Physical Domain Voice Template
 PHYSICAL_VOICE_TEMPLATE = """I am {task_name}. I am {role_description}.
@@ -98,80 +159,207 @@ PHYSICAL DOMAIN SPECIFICS:
 OUTPUT FORMAT: Return valid JSON matching the schema exactly."""
 
 
-def get_physical_user_prompt(task: Dict) -> str:
-    """Generate user prompt for ATL-Physical task interview."""
-    return f"""Generate a node interview for this ATL-Physical adversary task:
+# Structured-output schema mirroring the JSON scaffold in the user prompt
+class _Ownership(TypedDict):
+    actor_types: List[str]
+    skill_level: str
+    resource_requirements: str
+
+
+class _HD4Mapping(TypedDict):
+    primary_phase: str
+    secondary_phases: List[str]
+
+
+class _Indicators(TypedDict):
+    observable: List[str]
+    behavioral: List[str]
+    temporal: List[str]
+    material: List[str]
+
+
+class _DetectionMethods(TypedDict):
+    technical: List[str]
+    human: List[str]
+    procedural: List[str]
+
+
+class _Interdiction(TypedDict):
+    is_interdiction_point: bool
+    intervention_methods: List[str]
+    window_of_opportunity: str
+    consequences_of_miss: str
+
+
+class _MundanityAnalysis(TypedDict):
+    score: float
+    cover_activities: List[str]
+    distinguishing_factors: List[str]
+
+
+class _HistoricalExamples(TypedDict):
+    incidents: List[str]
+    lessons_learned: List[str]
+
+
+class _Dependencies(TypedDict):
+    requires: List[str]
+    enables: List[str]
+    alternatives: List[str]
+
+
+class _Countermeasures(TypedDict):
+    preventive: List[str]
+    detective: List[str]
+    responsive: List[str]
+
+
+class InterviewSchema(TypedDict):
+    task_id: str
+    domain: str
+    modality: str
+    voice: str
+    purpose: str
+    ownership: _Ownership
+    ttl_classification: str
+    phase_in_chain: int
+    hd4_mapping: _HD4Mapping
+    indicators: _Indicators
+    detection_methods: _DetectionMethods
+    interdiction: _Interdiction
+    mundanity_analysis: _MundanityAnalysis
+    historical_examples: _HistoricalExamples
+    dependencies: _Dependencies
+    countermeasures: _Countermeasures
+
+
+def _count(dirpath: Path, suffix: str) -> int:
+    """Count regular files ending in suffix using DirEntry type info (no per-file stat)."""
+    try:
+        with os.scandir(dirpath) as it:
+            return sum(1 for e in it if e.name.endswith(suffix) and e.is_file(follow_symlinks=False))
+    except FileNotFoundError:
+        return 0
+
+
+# User prompt scaffold; only the task fields are substituted per call
+_PHYSICAL_USER_PROMPT = Template("""Generate a node interview for this ATL-Physical adversary task:
 
 TASK DETAILS:
-- task_id: {task.get('task_id', '')}
-- title: {task.get('title', '')}
-- description: {task.get('description', '')}
-- phase: {task.get('phase', 0)}
-- classification: {task.get('classification', 'OPTIONAL')}
-- modality: {task.get('modality', 'IED')}
-- hd4_phases: {json.dumps(task.get('hd4_phases', []))}
-- is_interdiction_point: {task.get('is_interdiction_point', False)}
-- is_key_indicator: {task.get('is_key_indicator', False)}
-- mundanity_score: {task.get('mundanity_score', 0.5)}
-- node_form: {task.get('node_form', '1n')}
-- parent_task: {task.get('parent_task', '')}
-- related_tasks: {json.dumps(task.get('related_tasks', []))}
+- task_id: ${task_id}
+- title: ${title}
+- description: ${description}
+- phase: ${phase}
+- classification: ${classification}
+- modality: ${modality}
+- hd4_phases: ${hd4_phases}
+- is_interdiction_point: ${is_interdiction_point}
+- is_key_indicator: ${is_key_indicator}
+- mundanity_score: ${mundanity_score}
+- node_form: ${node_form}
+- parent_task: ${parent_task}
+- related_tasks: ${related_tasks}
 
 Generate a JSON response with this EXACT structure:
-{{
-    "task_id": "{task.get('task_id', '')}",
+{
+    "task_id": "${task_id}",
     "domain": "physical",
-    "modality": "{task.get('modality', 'IED')}",
+    "modality": "${modality}",
     "voice": "<first-person narrative following the template>",
     "purpose": "<what this task accomplishes in the attack chain>",
-    "ownership": {{
+    "ownership": {
         "actor_types": ["<lone wolf|cell|network|state-sponsored>"],
         "skill_level": "<low|medium|high|expert>",
         "resource_requirements": "<minimal|moderate|substantial|extensive>"
-    }},
-    "ttl_classification": "{task.get('classification', 'OPTIONAL')}",
-    "phase_in_chain": {task.get('phase', 0)},
-    "hd4_mapping": {{
+    },
+    "ttl_classification": "${classification}",
+    "phase_in_chain": ${phase},
+    "hd4_mapping": {
         "primary_phase": "<HUNT|DETECT|DISABLE|DISRUPT|DOMINATE>",
         "secondary_phases": ["<other applicable phases>"]
-    }},
-    "indicators": {{
+    },
+    "indicators": {
         "observable": ["<what can be seen/detected>"],
         "behavioral": ["<suspicious behaviors>"],
         "temporal": ["<timing patterns>"],
         "material": ["<physical evidence>"]
-    }},
-    "detection_methods": {{
+    },
+    "detection_methods": {
         "technical": ["<sensors, cameras, screening>"],
         "human": ["<behavioral analysis, informants, tips>"],
         "procedural": ["<background checks, verification>"]
-    }},
-    "interdiction": {{
-        "is_interdiction_point": {str(task.get('is_interdiction_point', False)).lower()},
+    },
+    "interdiction": {
+        "is_interdiction_point": ${is_interdiction_point_json},
         "intervention_methods": ["<how to disrupt at this point>"],
         "window_of_opportunity": "<how long intervention is possible>",
         "consequences_of_miss": "<what happens if not interdicted>"
-    }},
-    "mundanity_analysis": {{
-        "score": {task.get('mundanity_score', 0.5)},
+    },
+    "mundanity_analysis": {
+        "score": ${mundanity_score},
         "cover_activities": ["<legitimate activities this resembles>"],
         "distinguishing_factors": ["<what separates hostile from benign>"]
-    }},
-    "historical_examples": {{
+    },
+    "historical_examples": {
         "incidents": ["<real attacks where this task was observed>"],
         "lessons_learned": ["<what these incidents taught us>"]
-    }},
-    "dependencies": {{
+    },
+    "dependencies": {
         "requires": ["<prerequisite tasks>"],
         "enables": ["<downstream tasks>"],
         "alternatives": ["<substitute methods>"]
-    }},
-    "countermeasures": {{
+    },
+    "countermeasures": {
         "preventive": ["<stop before it happens>"],
         "detective": ["<identify when it happens>"],
         "responsive": ["<react after detection>"]
-    }}
-}}"""
+    }
+}""")
+
+
+def get_physical_user_prompt(task: Dict) -> str:
+    """Generate user prompt for ATL-Physical task interview."""
+    is_interdiction_point = task.get('is_interdiction_point', False)
+    return _PHYSICAL_USER_PROMPT.substitute(
+        task_id=task.get('task_id', ''),
+        title=task.get('title', ''),
+        description=task.get('description', ''),
+        phase=task.get('phase', 0),
+        classification=task.get('classification', 'OPTIONAL'),
+        modality=task.get('modality', 'IED'),
+        hd4_phases=json.dumps(task.get('hd4_phases', [])),
+        is_interdiction_point=is_interdiction_point,
+        is_interdiction_point_json=str(is_interdiction_point).lower(),
+        is_key_indicator=task.get('is_key_indicator', False),
+        mundanity_score=task.get('mundanity_score', 0.5),
+        node_form=task.get('node_form', '1n'),
+        parent_task=task.get('parent_task', ''),
+        related_tasks=json.dumps(task.get('related_tasks', [])),
+    )
+
+
+# task_id -> filesystem-safe stem ('.' and '/' become '_')
+_SAFE_ID = str.maketrans({'.': '_', '/': '_'})
+
+# Pooled Neo4j drivers shared by all generator instances, keyed by
+# (uri, user, sha256 of password) so different credentials never share a pool
+_DRIVERS: Dict[tuple, Any] = {}
+
+
+def _get_driver(uri: str, user: str, password: str):
+    """Return the process-wide pooled driver for this endpoint and credentials."""
+    key = (uri, user, hashlib.sha256(password.encode()).hexdigest())
+    driver = _DRIVERS.get(key)
+    if driver is None:
+        driver = GraphDatabase.driver(
+            uri,
+            auth=(user, password),
+            max_connection_pool_size=NEO4J_POOL_SIZE,
+            connection_acquisition_timeout=60,
+        )
+        _DRIVERS[key] = driver
+        atexit.register(driver.close)
+    return driver
 
 
 class ATLPhysicalInterviewGenerator:
@@ -187,32 +375,33 @@ class ATLPhysicalInterviewGenerator:
         self.neo4j_user = neo4j_user
         self.neo4j_password = neo4j_password
         self.driver = None
+        self._model = None
+        self._has_apoc: Optional[bool] = None
+        self.cache_hits = 0
+        self.cache_misses = 0
 
         # Ensure output directories exist
         ATL_INTERVIEWS_DIR.mkdir(parents=True, exist_ok=True)
         ATL_PROMPTS_DIR.mkdir(parents=True, exist_ok=True)
+        LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
     def connect_neo4j(self):
         """Connect to ATL-Physical Neo4j container."""
         if not HAS_NEO4J:
             raise RuntimeError("neo4j driver not installed")
-        self.driver = GraphDatabase.driver(
-            self.neo4j_uri,
-            auth=(self.neo4j_user, self.neo4j_password)
-        )
+        self.driver = _get_driver(self.neo4j_uri, self.neo4j_user, self.neo4j_password)
         logger.info(f"Connected to ATL-Physical Neo4j at {self.neo4j_uri}")
 
     def close(self):
-        """Close Neo4j connection."""
-        if self.driver:
-            self.driver.close()
+        """Release this generator's handle; the pooled driver closes at exit."""
+        self.driver = None
 
-    def get_tasks_from_neo4j(self) -> List[Dict]:
-        """Fetch all ATL-Physical tasks from Neo4j."""
+    def iter_tasks_from_neo4j(self) -> Iterator[Dict]:
+        """Stream ATL-Physical tasks from Neo4j as the driver delivers them."""
         if not self.driver:
             self.connect_neo4j()
 
-        tasks = []
+        count = 0
         with self.driver.session() as session:
             result = session.run("""
                 MATCH (t:ATLPhysical:AdversaryTask)
@@ -239,31 +428,41 @@ class ATLPhysicalInterviewGenerator:
                 ORDER BY t.phase, t.task_id
             """)
             for record in result:
-                tasks.append(dict(record))
+                count += 1
+                yield dict(record)
 
-        logger.info(f"Fetched {len(tasks)} ATL-Physical tasks from Neo4j")
-        return tasks
+        logger.info(f"Fetched {count} ATL-Physical tasks from Neo4j")
 
     def export_prompts(self) -> int:
         """Export ABE-ready prompt files for batch processing."""
-        tasks = self.get_tasks_from_neo4j()
         count = 0
 
-        for task in tasks:
-            task_id = task.get('task_id', 'unknown')
-            safe_id = task_id.replace('.', '_').replace('/', '_')
+        # Shared context is written once; prompt files join on task_id
+        (ATL_PROMPTS_DIR / "system_prompt.txt").write_text(SYSTEM_PROMPT)
 
-            prompt_data = {
-                "task_id": task_id,
-                "system_prompt": SYSTEM_PROMPT,
-                "user_prompt": get_physical_user_prompt(task),
-                "task_metadata": task
-            }
+        with ThreadPoolExecutor(max_workers=PROMPT_WRITE_WORKERS) as pool, \
+                open(ATL_PROMPTS_DIR / "tasks.jsonl", 'wb') as manifest:
+            futures = []
+            for task in self.iter_tasks_from_neo4j():
+                task_id = task.get('task_id', 'unknown')
+                safe_id = task_id.translate(_SAFE_ID)
+
+                manifest.write(dumps_json_line(task))
+
+                prompt_data = {
+                    "task_id": task_id,
+                    "user_prompt": get_physical_user_prompt(task),
+                }
 
-            prompt_file = ATL_PROMPTS_DIR / f"{safe_id}_prompt.json"
-            with open(prompt_file, 'w') as f:
-                json.dump(prompt_data, f, indent=2, default=str)
-            count += 1
+                prompt_file = ATL_PROMPTS_DIR / f"{safe_id}_prompt.json"
+                futures.append(pool.submit(write_json_file, prompt_file, prompt_data))
+
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    count += 1
+                except Exception as e:
+                    logger.warning(f"Failed to write prompt: {e}")
 
         logger.info(f"Exported {count} ATL-Physical prompts to {ATL_PROMPTS_DIR}")
         return count
@@ -292,48 +491,152 @@ class ATLPhysicalInterviewGenerator:
             logger.info("Loaded API key from environment")
         return api_key
 
-    def generate_interview(self, task: Dict) -> Optional[Dict]:
-        """Generate interview using Gemini API."""
+    def _get_model(self):
+        """Configure Gemini once and return the shared model (None if unavailable)."""
+        if self._model is None:
+            api_key = self._load_api_key()
+            if not api_key:
+                logger.error("No API key found in vault or environment")
+                return None
+
+            genai.configure(api_key=api_key)
+            self._model = self._build_model()
+        return self._model
+
+    @staticmethod
+    def _build_model():
+        """Build the model with SYSTEM_PROMPT as its system_instruction.
+
+        The prompt (~420 tokens) is far below Gemini's context-cache minimum,
+        so CachedContent is not used; system_instruction still keeps it out
+        of every per-task user message.
+        """
+        return genai.GenerativeModel(GEMINI_MODEL, system_instruction=SYSTEM_PROMPT)
+
+    @staticmethod
+    def _response_cache_key(task: Dict) -> str:
+        """Key a response by task payload, system prompt, model and temperature."""
+        h = hashlib.sha256(json.dumps(task, sort_keys=True, default=str).encode())
+        h.update(SYSTEM_PROMPT.encode())
+        h.update(f"{GEMINI_MODEL}|{GENERATION_TEMPERATURE}".encode())
+        return h.hexdigest()
+
+    def _response_cache_get(self, key: str) -> Optional[Dict]:
+        """Return a cached interview body, or None if missing/expired."""
+        path = LLM_CACHE_DIR / f"{key}.json"
+        try:
+            if time.time() - path.stat().st_mtime > RESPONSE_CACHE_TTL_SECONDS:
+                return None
+            return read_json_file(path)
+        except (OSError, ValueError):
+            return None
+
+    def _response_cache_put(self, key: str, interview: Dict):
+        """Store an interview body in the local response cache."""
+        write_json_file(LLM_CACHE_DIR / f"{key}.json", interview)
+
+    async def generate_interview_async(self, task: Dict) -> Optional[Dict]:
+        """Generate interview using the async Gemini API."""
+        cache_key = self._response_cache_key(task)
+        interview = self._response_cache_get(cache_key)
+        if interview is not None:
+            self.cache_hits += 1
+            logger.info(f"Cache hit for {task.get('task_id')}")
+        else:
+            interview = await self._call_gemini(task)
+            if interview is None:
+                return None
+            self.cache_misses += 1
+            self._response_cache_put(cache_key, interview)
+
+        interview['generated_at'] = datetime.now().isoformat()
+        interview['generator'] = GEMINI_MODEL
+        return interview
+
+    async def _call_gemini(self, task: Dict) -> Optional[Dict]:
+        """Call Gemini for one task and return the parsed interview body."""
         if not HAS_GENAI:
             logger.warning("google-generativeai not installed")
             return None
 
-        api_key = self._load_api_key()
-        if not api_key:
-            logger.error("No API key found in vault or environment")
+        model = self._get_model()
+        if model is None:
             return None
 
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
-
         try:
-            response = model.generate_content(
-                SYSTEM_PROMPT + "\n\n" + get_physical_user_prompt(task),
+            response = await model.generate_content_async(
+                get_physical_user_prompt(task),
                 generation_config=genai.GenerationConfig(
                     response_mime_type="application/json",
-                    temperature=0.7
+                    response_schema=InterviewSchema,
+                    temperature=GENERATION_TEMPERATURE
                 )
             )
 
-            interview = json.loads(response.text)
-            interview['generated_at'] = datetime.now().isoformat()
-            interview['generator'] = 'gemini-1.5-flash'
-            return interview
+            # SDKs that support structured output hand back the parsed object
+            parsed = getattr(response, 'parsed', None)
+            if isinstance(parsed, dict):
+                return parsed
+            return json.loads(response.text)
 
         except Exception as e:
             logger.error(f"Generation failed for {task.get('task_id')}: {e}")
             return None
 
-    def generate_all_interviews(self, limit: int = None) -> int:
+    def generate_interview(self, task: Dict) -> Optional[Dict]:
+        """Generate interview using Gemini API."""
+        return self._run_async(self.generate_interview_async(task))
+
+    def _run_async(self, coro):
+        """Run coro on its own event loop, then drop the model.
+
+        Gemini's async client binds to the loop it first runs on and
+        asyncio.run closes that loop, so the next call re-configures Gemini
+        (which discards the cached clients) instead of reusing a dead client.
+        """
+        try:
+            return asyncio.run(coro)
+        finally:
+            self._model = None
+
+    async def _generate_pending(
+        self,
+        pending: List[tuple],
+        concurrency: int,
+        rate_per_sec: float
+    ) -> int:
+        """Generate (task, output_file) pairs with bounded concurrency and pacing."""
+        sem = asyncio.Semaphore(concurrency)
+        limiter = AsyncRateLimiter(rate_per_sec)
+
+        async def run_one(task: Dict, output_file: Path) -> bool:
+            async with sem, limiter:
+                interview = await self.generate_interview_async(task)
+            if not interview:
+                return False
+            with open(output_file, 'w') as f:
+                json.dump(interview, f, indent=2)
+            logger.info(f"Generated interview for {task.get('task_id', 'unknown')}")
+            return True
+
+        results = await asyncio.gather(*(run_one(task, path) for task, path in pending))
+        return sum(results)
+
+    def generate_all_interviews(
+        self,
+        limit: int = None,
+        concurrency: int = GENERATION_CONCURRENCY,
+        rate_per_sec: float = GENERATION_RATE_PER_SEC
+    ) -> int:
         """Generate interviews for all tasks."""
-        tasks = self.get_tasks_from_neo4j()
+        tasks = self.iter_tasks_from_neo4j()
         if limit:
-            tasks = tasks[:limit]
+            tasks = islice(tasks, limit)
 
-        count = 0
+        pending = []
         for task in tasks:
             task_id = task.get('task_id', 'unknown')
-            safe_id = task_id.replace('.', '_').replace('/', '_')
+            safe_id = task_id.translate(_SAFE_ID)
 
             output_file = ATL_INTERVIEWS_DIR / f"{safe_id}_interview.json"
 
@@ -342,92 +645,402 @@ class ATLPhysicalInterviewGenerator:
                 logger.info(f"Skipping {task_id} - already exists")
                 continue
 
-            interview = self.generate_interview(task)
-            if interview:
-                with open(output_file, 'w') as f:
-                    json.dump(interview, f, indent=2)
-                count += 1
-                logger.info(f"Generated interview for {task_id}")
+            pending.append((task, output_file))
+
+        # Configure Gemini (vault read, model setup) before the event loop starts
+        if pending and HAS_GENAI:
+            self._get_model()
 
-            # Rate limiting
-            import time
-            time.sleep(0.5)
+        count = self._run_async(self._generate_pending(pending, concurrency, rate_per_sec)) if pending else 0
 
-        logger.info(f"Generated {count} new interviews")
+        logger.info(
+            f"Generated {count} new interviews "
+            f"(response cache: {self.cache_hits} hits, {self.cache_misses} misses)"
+        )
         return count
 
-    def load_interviews_to_neo4j(self) -> int:
-        """Load generated interviews back to Neo4j as Interview nodes."""
-        if not self.driver:
-            self.connect_neo4j()
+    @staticmethod
+    def _indicator_rows(task_id: str, interview: Dict) -> List[Dict]:
+        """Flatten an interview's indicators into UNWIND parameter rows."""
+        rows = []
+        indicators = interview.get('indicators', {})
+        for indicator_type, indicator_list in indicators.items():
+            if isinstance(indicator_list, list):
+                for indicator in indicator_list:
+                    if indicator:
+                        rows.append({"task_id": task_id, "text": indicator[:500], "type": indicator_type})
+        return rows
+
+    @staticmethod
+    def _group_indicator_rows(rows: List[Dict]) -> List[Dict]:
+        """Group rows by (text, type) so each Indicator is MERGEd by exactly one row."""
+        grouped: Dict[tuple, Dict] = {}
+        for row in rows:
+            key = (row["text"], row["type"])
+            if key not in grouped:
+                grouped[key] = {"text": row["text"], "type": row["type"], "task_ids": []}
+            grouped[key]["task_ids"].append(row["task_id"])
+        return list(grouped.values())
+
+    def _ingest_indicators(self, session, rows: List[Dict]):
+        """MERGE indicator nodes/links, in parallel via APOC when available."""
+        grouped = self._group_indicator_rows(rows)
+
+        if self._has_apoc is not False:
+            for attempt in range(1, INDICATOR_INGEST_RETRIES + 1):
+                try:
+                    record = session.run(
+                        "CALL apoc.periodic.iterate("
+                        "'UNWIND $rows AS r RETURN r', $action, "
+                        "{batchSize: $batch_size, parallel: true, concurrency: $concurrency, "
+                        "params: {rows: $rows}}) "
+                        "YIELD failedBatches, errorMessages "
+                        "RETURN failedBatches, errorMessages",
+                        rows=grouped,
+                        action=_INDICATOR_MERGE_CYPHER,
+                        batch_size=INDICATOR_INGEST_BATCH_SIZE,
+                        concurrency=INDICATOR_INGEST_CONCURRENCY,
+                    ).single()
+                except Exception as e:
+                    logger.info(f"APOC unavailable, using serial indicator ingest: {e}")
+                    self._has_apoc = False
+                    break
+
+                self._has_apoc = True
+                if not record["failedBatches"]:
+                    return
+                # Parallel MERGEs on shared Interview nodes can deadlock; the
+                # statement is idempotent so whole-set retries are safe.
+                logger.warning(
+                    f"{record['failedBatches']} indicator batches failed "
+                    f"(attempt {attempt}): {record['errorMessages']}"
+                )
+
+        for start in range(0, len(grouped), INDICATOR_INGEST_BATCH_SIZE):
+            session.execute_write(
+                self._merge_indicators_tx, grouped[start:start + INDICATOR_INGEST_BATCH_SIZE]
+            )
+
+    @staticmethod
+    def _merge_interviews_tx(tx, interviews: List[Dict]):
+        """Transaction function: upsert Interview nodes linked to their tasks."""
+        tx.run("""
+            UNWIND $interviews AS x
+            MATCH (t:ATLPhysical:AdversaryTask {task_id: x.task_id})
+            MERGE (i:ATLPhysical:Interview {task_id: x.task_id})
+            SET i += x.props,
+                i.domain = 'physical',
+                i.updated_at = datetime()
+            MERGE (t)-[:HAS_INTERVIEW]->(i)
+        """, interviews=interviews)
+
+    @staticmethod
+    def _merge_indicators_tx(tx, grouped: List[Dict]):
+        """Transaction function: serial indicator MERGE (non-APOC path)."""
+        tx.run("UNWIND $rows AS r " + _INDICATOR_MERGE_CYPHER, rows=grouped)
+
+    def _write_interview_batch(self, session, interviews: List[Dict]) -> int:
+        """Write a batch of interviews.
+
+        Uses managed transactions (execute_write), which commit once per
+        batch and retry the whole batch on TransientError/deadlocks. A batch
+        that still fails is re-raised so the load stops before indicators
+        are ingested for interviews that were never written.
+        """
+        try:
+            session.execute_write(self._merge_interviews_tx, interviews)
+        except Exception as e:
+            logger.error(f"Failed to load batch of {len(interviews)} interviews: {e}")
+            raise
+        return len(interviews)
+
+    def _load_shard(self, files: List[Path], existing: set) -> Tuple[int, int, List[Dict]]:
+        """Load one shard of interview files on its own session.
 
+        Returns (loaded, skipped, indicator_rows); indicators are ingested
+        afterwards by the caller so shards never race on shared Indicator nodes.
+        """
         count = 0
-        interview_files = list(ATL_INTERVIEWS_DIR.glob("*_interview.json"))
+        skipped = 0
+        interviews: List[Dict] = []
+        indicators: List[Dict] = []
 
         with self.driver.session() as session:
-            # Create Interview node index
+            for task_id, interview in self._iter_interviews(files):
+                if task_id in existing:
+                    skipped += 1
+                    continue
+
+                blob_path = self._write_interview_blob(task_id, interview)
+                interviews.append({"task_id": task_id, "props": self._interview_props(interview, blob_path)})
+                indicators.extend(self._indicator_rows(task_id, interview))
+
+                if len(interviews) >= LOAD_BATCH_SIZE:
+                    count += self._write_interview_batch(session, interviews)
+                    logger.info(f"Loaded {count} interviews in shard...")
+                    interviews = []
+
+            if interviews:
+                count += self._write_interview_batch(session, interviews)
+
+        return count, skipped, indicators
+
+    def _iter_interviews(self, files: Optional[List[Path]] = None) -> Iterator[Tuple[str, Dict]]:
+        """Yield (task_id, interview) for every readable local interview file."""
+        if files is None:
+            files = ATL_INTERVIEWS_DIR.glob("*_interview.json")
+        for interview_file in files:
             try:
-                session.run("""
-                    CREATE INDEX atl_interview_task IF NOT EXISTS
-                    FOR (i:ATLPhysical:Interview) ON (i.task_id)
-                """)
-            except:
-                pass
-
-            for interview_file in interview_files:
-                try:
-                    with open(interview_file) as f:
-                        interview = json.load(f)
+                interview = read_json_file(interview_file)
+            except Exception as e:
+                logger.warning(f"Failed to load {interview_file.name}: {e}")
+                continue
 
-                    task_id = interview.get('task_id', '')
-                    if not task_id:
+            task_id = interview.get('task_id', '')
+            if task_id:
+                yield task_id, interview
+
+    @staticmethod
+    def _write_interview_blob(task_id: str, interview: Dict) -> str:
+        """Store the full interview compressed off-graph; return its path."""
+        ATL_BLOBS_DIR.mkdir(parents=True, exist_ok=True)
+        safe_id = task_id.translate(_SAFE_ID)
+        raw = json.dumps(interview).encode()
+        if HAS_ZSTD:
+            path = ATL_BLOBS_DIR / f"{safe_id}.json.zst"
+            path.write_bytes(zstandard.ZstdCompressor(level=10).compress(raw))
+        else:
+            path = ATL_BLOBS_DIR / f"{safe_id}.json.gz"
+            path.write_bytes(gzip.compress(raw))
+        return str(path)
+
+    @staticmethod
+    def _interview_props(interview: Dict, blob_path: str) -> Dict:
+        """Interview node properties (excluding task_id/domain/updated_at).
+
+        The full interview is kept out of the graph; the node only carries
+        the path of its compressed blob (see _write_interview_blob).
+        """
+        return {
+            "voice": interview.get('voice', '')[:5000],
+            "purpose": interview.get('purpose', '')[:2000],
+            "modality": interview.get('modality', 'IED'),
+            "full_interview_path": blob_path,
+            "generated_at": interview.get('generated_at', ''),
+            "generator": interview.get('generator', 'unknown'),
+        }
+
+    def export_csv_for_admin_import(
+        self,
+        task_ids: set,
+        existing_indicators: Optional[set] = None,
+        import_dir: Optional[Path] = None,
+    ) -> Tuple[Dict[str, Path], int, List[Dict]]:
+        """Write neo4j-admin import CSVs for the local interviews of `task_ids`.
+
+        Only new Interview/Indicator nodes and the HAS_INDICATOR links between
+        them go into the CSVs. HAS_INTERVIEW links (AdversaryTask nodes are not
+        part of the import) and links to indicators already in the database
+        are left to bulk_import_with_admin; the latter are returned, with the
+        interview count, as indicator rows for _ingest_indicators.
+        """
+        existing_indicators = existing_indicators or set()
+        import_dir = import_dir or ATL_IMPORT_DIR
+        import_dir.mkdir(parents=True, exist_ok=True)
+        paths = {
+            "interviews": import_dir / "interviews_nodes.csv",
+            "indicators": import_dir / "indicators_nodes.csv",
+            "has_indicator": import_dir / "has_indicator_rels.csv",
+        }
+
+        indicator_ids: Dict[tuple, str] = {}
+        link_rows: List[Dict] = []
+        count = 0
+        with open(paths["interviews"], 'w', newline='') as f_iv, \
+                open(paths["indicators"], 'w', newline='') as f_ind, \
+                open(paths["has_indicator"], 'w', newline='') as f_hind:
+            interviews_csv = csv.writer(f_iv)
+            indicators_csv = csv.writer(f_ind)
+            has_indicator_csv = csv.writer(f_hind)
+
+            interviews_csv.writerow([
+                "task_id:ID(Interview)", "voice", "purpose", "modality", "full_interview_path",
+                "generated_at", "generator", "domain", ":LABEL"
+            ])
+            # Bare :ID - the ind{n} ids only join the CSVs; Indicators stay keyed on text+type
+            indicators_csv.writerow([":ID(Indicator)", "text", "type", ":LABEL"])
+            has_indicator_csv.writerow([":START_ID(Interview)", ":END_ID(Indicator)", ":TYPE"])
+
+            for task_id, interview in self._iter_interviews():
+                if task_id not in task_ids:
+                    continue
+
+                blob_path = self._write_interview_blob(task_id, interview)
+                props = self._interview_props(interview, blob_path)
+                interviews_csv.writerow([
+                    task_id, props["voice"], props["purpose"], props["modality"],
+                    props["full_interview_path"], props["generated_at"], props["generator"],
+                    "physical", "ATLPhysical;Interview"
+                ])
+
+                for row in self._indicator_rows(task_id, interview):
+                    key = (row["text"], row["type"])
+                    if key in existing_indicators:
+                        link_rows.append(row)
                         continue
+                    ind_id = indicator_ids.get(key)
+                    if ind_id is None:
+                        ind_id = indicator_ids[key] = f"ind{len(indicator_ids)}"
+                        indicators_csv.writerow([ind_id, row["text"], row["type"], "ATLPhysical;Indicator"])
+                    has_indicator_csv.writerow([task_id, ind_id, "HAS_INDICATOR"])
+                count += 1
 
-                    # Store interview as node linked to task
-                    session.run("""
-                        MATCH (t:ATLPhysical:AdversaryTask {task_id: $task_id})
-                        MERGE (i:ATLPhysical:Interview {task_id: $task_id})
-                        SET i.voice = $voice,
-                            i.purpose = $purpose,
-                            i.domain = 'physical',
-                            i.modality = $modality,
-                            i.full_interview = $full_interview,
-                            i.generated_at = $generated_at,
-                            i.generator = $generator,
-                            i.updated_at = datetime()
-                        MERGE (t)-[:HAS_INTERVIEW]->(i)
-                    """,
-                        task_id=task_id,
-                        voice=interview.get('voice', '')[:5000],
-                        purpose=interview.get('purpose', '')[:2000],
-                        modality=interview.get('modality', 'IED'),
-                        full_interview=json.dumps(interview)[:10000],
-                        generated_at=interview.get('generated_at', ''),
-                        generator=interview.get('generator', 'unknown')
-                    )
-
-                    # Store indicators as separate nodes for graph queries
-                    indicators = interview.get('indicators', {})
-                    for indicator_type, indicator_list in indicators.items():
-                        if isinstance(indicator_list, list):
-                            for indicator in indicator_list:
-                                if indicator:
-                                    session.run("""
-                                        MATCH (i:ATLPhysical:Interview {task_id: $task_id})
-                                        MERGE (ind:ATLPhysical:Indicator {
-                                            text: $text,
-                                            type: $type
-                                        })
-                                        MERGE (i)-[:HAS_INDICATOR]->(ind)
-                                    """, task_id=task_id, text=indicator[:500], type=indicator_type)
+        logger.info(
+            f"Wrote admin-import CSVs for {count} interviews, "
+            f"{len(indicator_ids)} indicators to {import_dir}"
+        )
+        return paths, count, link_rows
+
+    @staticmethod
+    def _link_interviews_tx(tx):
+        """Transaction function: link unlinked Interview nodes to their tasks by task_id."""
+        tx.run("""
+            MATCH (i:ATLPhysical:Interview)
+            WHERE NOT (:ATLPhysical:AdversaryTask)-[:HAS_INTERVIEW]->(i)
+            MATCH (t:ATLPhysical:AdversaryTask {task_id: i.task_id})
+            MERGE (t)-[:HAS_INTERVIEW]->(i)
+        """)
+
+    def bulk_import_with_admin(self, database: str = ATL_IMPORT_DATABASE) -> bool:
+        """Bulk-load new interviews via `neo4j-admin database import incremental`.
+
+        Interviews already in Neo4j, or whose AdversaryTask is missing, are
+        left out of the import (the same rows the MERGE path would skip).
+        Incremental import only runs against a stopped database, so the
+        target is stopped through the system database for the import and
+        started again afterwards (Enterprise, like incremental import itself);
+        tasks are then matched to the imported interviews by task_id over
+        Bolt. The MERGE path (load_interviews_to_neo4j) remains the way to
+        update interviews that are already loaded.
+        """
+        if not self.driver:
+            self.connect_neo4j()
 
-                    count += 1
-                    if count % 20 == 0:
-                        logger.info(f"Loaded {count} interviews...")
+        with self.driver.session(database=database) as session:
+            tasks = set(session.run(
+                "MATCH (t:ATLPhysical:AdversaryTask) RETURN t.task_id AS id"
+            ).value())
+            existing = set(session.run(
+                "MATCH (i:ATLPhysical:Interview) RETURN i.task_id AS id"
+            ).value())
+            existing_indicators = {
+                (text, ind_type) for text, ind_type in session.run(
+                    "MATCH (ind:ATLPhysical:Indicator) RETURN ind.text, ind.type"
+                ).values()
+            }
 
-                except Exception as e:
-                    logger.warning(f"Failed to load {interview_file.name}: {e}")
+        paths, count, link_rows = self.export_csv_for_admin_import(tasks - existing, existing_indicators)
+        if not count:
+            logger.info("No new interviews to import")
+            return True
+
+        cmd = [
+            "neo4j-admin", "database", "import", "incremental", "--force",
+            f"--nodes={paths['interviews']}",
+            f"--nodes={paths['indicators']}",
+            f"--relationships={paths['has_indicator']}",
+            database,
+        ]
+
+        if not shutil.which(cmd[0]):
+            logger.warning("neo4j-admin not on PATH; run inside the Neo4j container:")
+            logger.warning("  " + " ".join(cmd))
+            return False
+
+        with self.driver.session(database="system") as session:
+            session.run(f"STOP DATABASE `{database}` WAIT").consume()
+        try:
+            logger.info(f"Running: {' '.join(cmd)}")
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        finally:
+            with self.driver.session(database="system") as session:
+                session.run(f"START DATABASE `{database}` WAIT").consume()
+        if result.returncode != 0:
+            logger.error(f"neo4j-admin import failed: {result.stderr.strip()}")
+            return False
+
+        try:
+            with self.driver.session(database=database) as session:
+                session.execute_write(self._link_interviews_tx)
+                if link_rows:
+                    self._ingest_indicators(session, link_rows)
+        except Exception as e:
+            logger.error(f"Failed to link imported interviews: {e}")
+            return False
+        return True
+
+    def load_interviews_to_neo4j(self, force: bool = False, writers: int = LOAD_WRITER_THREADS) -> int:
+        """Load generated interviews back to Neo4j as Interview nodes.
+
+        Interviews already present in Neo4j are skipped unless force=True.
+        Files are split across `writers` threads, each with its own session.
+        A batch that fails to write raises, and indicators are not ingested.
+        """
+        if writers < 1:
+            raise ValueError(f"writers must be at least 1, got {writers}")
+
+        if not self.driver:
+            self.connect_neo4j()
+
+        with self.driver.session() as session:
+            # Create lookup indexes for every MERGE/MATCH key before loading
+            try:
+                with session.begin_transaction() as tx:
+                    tx.run("""
+                        CREATE INDEX atl_interview_task IF NOT EXISTS
+                        FOR (i:ATLPhysical:Interview) ON (i.task_id)
+                    """)
+                    tx.run("""
+                        CREATE INDEX atl_indicator_text_type IF NOT EXISTS
+                        FOR (ind:ATLPhysical:Indicator) ON (ind.text, ind.type)
+                    """)
+                    tx.run("""
+                        CREATE INDEX atl_task_id IF NOT EXISTS
+                        FOR (t:ATLPhysical:AdversaryTask) ON (t.task_id)
+                    """)
+                    tx.commit()
+            except Exception as e:
+                logger.warning(f"Index creation failed: {e}")
+
+            existing = set()
+            if not force:
+                existing = set(session.run(
+                    "MATCH (i:ATLPhysical:Interview) RETURN i.task_id AS id"
+                ).value())
 
+        # One interview file per task, so sharding on the file name keeps each
+        # Interview/AdversaryTask pair on a single writer (no lock contention).
+        shards: List[List[Path]] = [[] for _ in range(writers)]
+        for interview_file in ATL_INTERVIEWS_DIR.glob("*_interview.json"):
+            shards[zlib.crc32(interview_file.name.encode()) % writers].append(interview_file)
+
+        with ThreadPoolExecutor(max_workers=writers) as pool:
+            results = list(pool.map(lambda files: self._load_shard(files, existing), shards))
+
+        count = sum(r[0] for r in results)
+        skipped = sum(r[1] for r in results)
+        indicators = [row for r in results for row in r[2]]
+
+        # Store indicators as separate nodes for graph queries
+        if indicators:
+            try:
+                with self.driver.session() as session:
+                    self._ingest_indicators(session, indicators)
+            except Exception as e:
+                logger.warning(f"Failed to load {len(indicators)} indicators: {e}")
+
+        if skipped:
+            logger.info(f"Skipped {skipped} interviews already in Neo4j (use --force to reload)")
         logger.info(f"Loaded {count} interviews to ATL-Physical Neo4j")
         return count
 
@@ -437,18 +1050,20 @@ class ATLPhysicalInterviewGenerator:
             self.connect_neo4j()
 
         with self.driver.session() as session:
+            # Independent subqueries: each count is computed on its own
+            # instead of being chained through OPTIONAL MATCH row streams.
             result = session.run("""
-                MATCH (t:ATLPhysical:AdversaryTask) WITH count(t) as total_tasks
-                OPTIONAL MATCH (i:ATLPhysical:Interview) WITH total_tasks, count(i) as interviews
-                OPTIONAL MATCH ()-[r:HAS_INTERVIEW]->() WITH total_tasks, interviews, count(r) as linked
-                OPTIONAL MATCH (ind:ATLPhysical:Indicator)
-                RETURN total_tasks, interviews, linked, count(ind) as indicators
+                CALL { MATCH (t:ATLPhysical:AdversaryTask) RETURN count(t) AS total_tasks }
+                CALL { MATCH (i:ATLPhysical:Interview) RETURN count(i) AS interviews }
+                CALL { MATCH ()-[r:HAS_INTERVIEW]->() RETURN count(r) AS linked }
+                CALL { MATCH (ind:ATLPhysical:Indicator) RETURN count(ind) AS indicators }
+                RETURN total_tasks, interviews, linked, indicators
             """)
             record = result.single()
 
             # Count local files
-            prompt_count = len(list(ATL_PROMPTS_DIR.glob("*_prompt.json")))
-            interview_count = len(list(ATL_INTERVIEWS_DIR.glob("*_interview.json")))
+            prompt_count = _count(ATL_PROMPTS_DIR, "_prompt.json")
+            interview_count = _count(ATL_INTERVIEWS_DIR, "_interview.json")
 
             return {
                 "neo4j_tasks": record["total_tasks"] if record else 0,
@@ -465,10 +1080,22 @@ def main():
     parser.add_argument("--export-prompts", action="store_true", help="Export ABE-ready prompts")
     parser.add_argument("--generate", action="store_true", help="Generate interviews with API")
     parser.add_argument("--limit", type=int, help="Limit number of interviews to generate")
+    parser.add_argument("--concurrency", type=int, default=GENERATION_CONCURRENCY,
+                        help="Max in-flight Gemini requests")
+    parser.add_argument("--rate", type=float, default=GENERATION_RATE_PER_SEC,
+                        help="Max Gemini requests started per second")
     parser.add_argument("--load-to-neo4j", action="store_true", help="Load interviews to Neo4j")
+    parser.add_argument("--force", action="store_true",
+                        help="Reload interviews that already exist in Neo4j")
+    parser.add_argument("--writers", type=int, default=LOAD_WRITER_THREADS,
+                        help="Parallel Neo4j writer threads for --load-to-neo4j")
+    parser.add_argument("--bulk-csv", action="store_true",
+                        help="Cold-load interviews with neo4j-admin CSV import instead of MERGE")
     parser.add_argument("--stats", action="store_true", help="Show statistics")
     parser.add_argument("--all", action="store_true", help="Run full pipeline")
     args = parser.parse_args()
+    if args.writers < 1:
+        parser.error("--writers must be at least 1")
 
     generator = ATLPhysicalInterviewGenerator()
 
@@ -492,10 +1119,16 @@ def main():
             generator.export_prompts()
 
         if args.generate or args.all:
-            generator.generate_all_interviews(limit=args.limit)
+            generator.generate_all_interviews(
+                limit=args.limit,
+                concurrency=args.concurrency,
+                rate_per_sec=args.rate
+            )
 
-        if args.load_to_neo4j or args.all:
-            generator.load_interviews_to_neo4j()
+        if args.bulk_csv:
+            generator.bulk_import_with_admin()
+        elif args.load_to_neo4j or args.all:
+            generator.load_interviews_to_neo4j(force=args.force, writers=args.writers)
 
         # Show final stats
         stats = generator.get_stats()
@@ -4,12 +4,66 @@ Baseline Quality Comparison - 3 LLM Providers
 Establishes foundation benchmarks for node interview generation
 """
 
-import json
+import asyncio
+import functools
+import hashlib
+import importlib.util
+import re
 import time
 import os
 from pathlib import Path
 from datetime import datetime
 
+from json_io import dumps_json_line, loads, read_json_file, write_json_file
+from rate_limiter import AsyncRateLimiter
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+# One keep-alive (HTTP/2 when h2 is installed) pool shared by the OpenAI/Anthropic clients
+_HTTP = None
+
+
+def _http_client():
+    """Return the shared httpx.AsyncClient, creating it on first use."""
+    global _HTTP
+    if _HTTP is None:
+        import httpx
+        _HTTP = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30),
+            timeout=httpx.Timeout(60.0)
+        )
+    return _HTTP
+
+
+async def _close_http_client():
+    """Close the shared pool (if one was opened) so the next run starts fresh."""
+    global _HTTP
+    if _HTTP is not None:
+        await _HTTP.aclose()
+        _HTTP = None
+    # SDK clients hold the closed pool / the finished event loop; rebuild on next use
+    for factory in (_openai_client, _anthropic_client, _gemini_model, _vertex_model):
+        factory.cache_clear()
+
+
+# Exact-match response cache: re-running the baseline on the same task skips the API
+RESPONSE_CACHE_DIR = Path(__file__).parent / "output" / "llm_cache" / "baseline"
+
+# Batch runs: per-provider (max in-flight, request starts/sec), retries, resumable checkpoint
+PROVIDER_LIMITS = {
+    "gemini_api": (10, 5.0),
+    "vertex_ai": (10, 5.0),
+    "openai": (8, 4.0),
+    "anthropic": (5, 2.0)
+}
+BATCH_MAX_RETRIES = 3
+BATCH_OUTPUT_FILE = Path(__file__).parent / "output" / "baseline_comparison.jsonl"
+
 # Refined voice format based on user requirements
 SYSTEM_PROMPT_V2 = """You are an expert threat intelligence analyst creating node interviews for CTAS (Cognitive Threat Analysis System) v7.3.1.
 
@@ -26,24 +80,33 @@ SEARCH OPTIMIZATION (REQUIRED):
 Include keywords, synonyms, long-tail phrases, AND slang/forum terminology for embedding and detection systems.
 
 OUTPUT: Return valid JSON matching the schema exactly."""
+_SYSTEM_PROMPT_V2_BYTES = SYSTEM_PROMPT_V2.encode()
 
 def get_user_prompt_v2(task: dict) -> str:
     """Enhanced prompt with refined voice and search requirements."""
+    return _user_prompt_v2(
+        task['task_id'], task['task_name'], task['category'], task['hd4_phase'], task['description']
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _user_prompt_v2(task_id: str, task_name: str, category: str, hd4_phase: str, description: str) -> str:
+    """Build the ~3KB prompt once per distinct task; every provider call reuses it."""
     return f"""Generate a node interview for this CTAS task:
 
-TASK: {task['task_name']}
-CATEGORY: {task['category']}
-HD4 PHASE: {task['hd4_phase']}
-DESCRIPTION: {task['description']}
+TASK: {task_name}
+CATEGORY: {category}
+HD4 PHASE: {hd4_phase}
+DESCRIPTION: {description}
 
 Return JSON with this structure:
 {{
-    "task_id": "{task['task_id']}",
-    "task_name": "{task['task_name']}",
-    "hd4_phase": "{task['hd4_phase']}",
-    "category": "{task['category']}",
+    "task_id": "{task_id}",
+    "task_name": "{task_name}",
+    "hd4_phase": "{hd4_phase}",
+    "category": "{category}",
 
-    "voice": "I am {task['task_name']}. My objectives are [specific goals]. I am found in attacks such as [APT29/SolarWinds 2020, APT28/DNC 2016]. I operate in locations such as [targets]. I use tools such as [specific tools]. I maintain [persistence]. I remain undetected by [OPSEC methods]. My potential indicators are [detection points].",
+    "voice": "I am {task_name}. My objectives are [specific goals]. I am found in attacks such as [APT29/SolarWinds 2020, APT28/DNC 2016]. I operate in locations such as [targets]. I use tools such as [specific tools]. I maintain [persistence]. I remain undetected by [OPSEC methods]. My potential indicators are [detection points].",
 
     "purpose": "[One sentence: what this task accomplishes]",
     "ownership": "[One sentence: what this task owns in the kill chain]",
@@ -108,191 +171,257 @@ CRITICAL:
 - Be SPECIFIC not generic"""
 
 
-def test_gemini_api(task: dict, api_key: str) -> dict:
-    """Test Gemini API provider."""
-    import google.generativeai as genai
+def _cached(provider: str, model: str):
+    """Serve repeat (provider, model, system prompt, user prompt) calls from disk."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(task: dict, *args, **kwargs) -> dict:
+            h = hashlib.sha256(f"{provider}|{model}".encode())
+            h.update(_SYSTEM_PROMPT_V2_BYTES)
+            h.update(get_user_prompt_v2(task).encode())
+            path = RESPONSE_CACHE_DIR / f"{h.hexdigest()}.json"
+            try:
+                result = read_json_file(path)
+                result["cached"] = True
+                return result
+            except (OSError, ValueError):
+                pass
+
+            result = await fn(task, *args, **kwargs)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_json_file(path, result)
+            return result
+        return wrapper
+    return decorator
+
+
+# First fenced block (```json or bare ```) in a model response
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+def _extract_json(content: str) -> str:
+    """Return the JSON body of a response, unwrapping a markdown fence if present."""
+    m = _FENCE_RE.search(content)
+    return (m.group(1) if m else content).strip()
+
+
+async def _drain(pieces, start: float) -> tuple:
+    """Join streamed text pieces; returns (content, seconds to first piece)."""
+    parts = []
+    first = None
+    async for piece in pieces:
+        if piece:
+            if first is None:
+                first = time.time() - start
+            parts.append(piece)
+    return "".join(parts), first
+
+
+@functools.lru_cache(maxsize=None)
+def _openai_client(api_key: str):
+    """One AsyncOpenAI client per key, reused across calls."""
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=api_key, http_client=_http_client())
+
+
+@functools.lru_cache(maxsize=None)
+def _anthropic_client(api_key: str):
+    """One AsyncAnthropic client per key, reused across calls."""
+    import anthropic
+    return anthropic.AsyncAnthropic(api_key=api_key, http_client=_http_client())
 
+
+@functools.lru_cache(maxsize=None)
+def _gemini_model(api_key: str):
+    """Configure the Gemini API once per key and reuse the model handle."""
+    import google.generativeai as genai
     genai.configure(api_key=api_key)
-    model = genai.GenerativeModel(
+    return genai.GenerativeModel(
         model_name="gemini-2.0-flash-exp",
         system_instruction=SYSTEM_PROMPT_V2
     )
 
+
+@functools.lru_cache(maxsize=None)
+def _vertex_model():
+    """Initialize Vertex AI once and reuse the model handle."""
+    import vertexai
+    from vertexai.generative_models import GenerativeModel
+    vertexai.init(project="gen-lang-client-0290627006", location="us-central1")
+    return GenerativeModel(
+        model_name="gemini-2.0-flash-exp",
+        system_instruction=SYSTEM_PROMPT_V2
+    )
+
+
+@_cached("gemini_api", "gemini-2.0-flash-exp")
+async def test_gemini_api(task: dict, api_key: str) -> dict:
+    """Test Gemini API provider."""
+    import google.generativeai as genai
+
+    model = _gemini_model(api_key)
+
     start = time.time()
-    response = model.generate_content(
+    response = await model.generate_content_async(
         get_user_prompt_v2(task),
         generation_config=genai.types.GenerationConfig(
             max_output_tokens=4096,
             temperature=0.7
-        )
+        ),
+        stream=True
     )
+    content, first = await _drain((chunk.text async for chunk in response), start)
     elapsed = time.time() - start
 
-    content = response.text
-    if "```json" in content:
-        json_str = content.split("```json")[1].split("```")[0]
-    elif "```" in content:
-        json_str = content.split("```")[1].split("```")[0]
-    else:
-        json_str = content
-
     return {
         "provider": "gemini_api",
         "model": "gemini-2.0-flash-exp",
         "time_seconds": round(elapsed, 2),
-        "interview": json.loads(json_str.strip()),
+        "first_token_seconds": round(first if first is not None else elapsed, 2),
+        "interview": loads(_extract_json(content)),
         "raw_length": len(content)
     }
 
 
-def test_vertex_ai(task: dict) -> dict:
+@_cached("vertex_ai", "gemini-2.0-flash-exp")
+async def test_vertex_ai(task: dict) -> dict:
     """Test Vertex AI provider (uses gcloud auth)."""
-    import vertexai
-    from vertexai.generative_models import GenerativeModel, GenerationConfig
+    from vertexai.generative_models import GenerationConfig
 
-    vertexai.init(project="gen-lang-client-0290627006", location="us-central1")
-    model = GenerativeModel(
-        model_name="gemini-2.0-flash-exp",
-        system_instruction=SYSTEM_PROMPT_V2
-    )
+    model = _vertex_model()
 
     start = time.time()
-    response = model.generate_content(
+    response = await model.generate_content_async(
         get_user_prompt_v2(task),
         generation_config=GenerationConfig(
             max_output_tokens=4096,
             temperature=0.7
-        )
+        ),
+        stream=True
     )
+    content, first = await _drain((chunk.text async for chunk in response), start)
     elapsed = time.time() - start
 
-    content = response.text
-    if "```json" in content:
-        json_str = content.split("```json")[1].split("```")[0]
-    elif "```" in content:
-        json_str = content.split("```")[1].split("```")[0]
-    else:
-        json_str = content
-
     return {
         "provider": "vertex_ai",
         "model": "gemini-2.0-flash-exp",
         "time_seconds": round(elapsed, 2),
-        "interview": json.loads(json_str.strip()),
+        "first_token_seconds": round(first if first is not None else elapsed, 2),
+        "interview": loads(_extract_json(content)),
         "raw_length": len(content)
     }
 
 
-def test_anthropic(task: dict, api_key: str) -> dict:
+@_cached("anthropic", "claude-sonnet-4-20250514")
+async def test_anthropic(task: dict, api_key: str) -> dict:
     """Test Anthropic Claude provider."""
-    import anthropic
-
-    client = anthropic.Anthropic(api_key=api_key)
+    client = _anthropic_client(api_key)
 
     start = time.time()
-    response = client.messages.create(
+    async with client.messages.stream(
         model="claude-sonnet-4-20250514",
         max_tokens=4096,
         system=SYSTEM_PROMPT_V2,
         messages=[{"role": "user", "content": get_user_prompt_v2(task)}]
-    )
+    ) as stream:
+        content, first = await _drain(stream.text_stream, start)
     elapsed = time.time() - start
 
-    content = response.content[0].text
-    if "```json" in content:
-        json_str = content.split("```json")[1].split("```")[0]
-    elif "```" in content:
-        json_str = content.split("```")[1].split("```")[0]
-    else:
-        json_str = content
-
     return {
         "provider": "anthropic",
         "model": "claude-sonnet-4-20250514",
         "time_seconds": round(elapsed, 2),
-        "interview": json.loads(json_str.strip()),
+        "first_token_seconds": round(first if first is not None else elapsed, 2),
+        "interview": loads(_extract_json(content)),
         "raw_length": len(content)
     }
 
 
-def test_openai(task: dict, api_key: str) -> dict:
+@_cached("openai", "gpt-4o")
+async def test_openai(task: dict, api_key: str) -> dict:
     """Test OpenAI GPT-4 provider."""
-    from openai import OpenAI
-
-    client = OpenAI(api_key=api_key)
+    client = _openai_client(api_key)
 
     start = time.time()
-    response = client.chat.completions.create(
+    response = await client.chat.completions.create(
         model="gpt-4o",
         max_tokens=4096,
         temperature=0.7,
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT_V2},
             {"role": "user", "content": get_user_prompt_v2(task)}
-        ]
+        ],
+        stream=True
+    )
+    content, first = await _drain(
+        (chunk.choices[0].delta.content async for chunk in response if chunk.choices), start
     )
     elapsed = time.time() - start
 
-    content = response.choices[0].message.content
-    if "```json" in content:
-        json_str = content.split("```json")[1].split("```")[0]
-    elif "```" in content:
-        json_str = content.split("```")[1].split("```")[0]
-    else:
-        json_str = content
-
     return {
         "provider": "openai",
         "model": "gpt-4o",
         "time_seconds": round(elapsed, 2),
-        "interview": json.loads(json_str.strip()),
+        "first_token_seconds": round(first if first is not None else elapsed, 2),
+        "interview": loads(_extract_json(content)),
         "raw_length": len(content)
     }
 
 
-def evaluate_quality(result: dict) -> dict:
-    """Evaluate interview quality against requirements."""
-    interview = result.get("interview", {})
+# Required phrases of the voice format
+VOICE_ELEMENTS = [
+    "My objectives are",
+    "found in attacks such as",
+    "operate in locations",
+    "use tools such as",
+    "maintain",
+    "remain undetected",
+    "indicators are"
+]
+# Lookahead so overlapping phrases are all reported
+_VOICE_RE = re.compile("(?=(" + "|".join(re.escape(e.lower()) for e in VOICE_ELEMENTS) + "))")
+
+
+def _quality_scores(interview: dict) -> tuple:
+    """Unrounded voice_format, search_completeness, mitre_present, apt_examples, specificity."""
     voice = interview.get("voice", "")
     search = interview.get("search", {})
 
-    scores = {
-        "voice_format": 0,
-        "search_completeness": 0,
-        "mitre_present": 0,
-        "apt_examples": 0,
-        "specificity": 0
-    }
-
-    # Voice format check
-    voice_elements = [
-        "My objectives are",
-        "found in attacks such as",
-        "operate in locations",
-        "use tools such as",
-        "maintain",
-        "remain undetected",
-        "indicators are"
-    ]
-    voice_score = sum(1 for e in voice_elements if e.lower() in voice.lower())
-    scores["voice_format"] = round(voice_score / len(voice_elements), 2)
+    # Voice format check: one lowercase copy, one regex pass
+    voice_format = len(set(_VOICE_RE.findall(voice.lower()))) / len(VOICE_ELEMENTS)
 
     # Search completeness
     search_fields = ["keywords", "synonyms", "long_tail_phrases", "slang"]
-    search_score = sum(1 for f in search_fields if search.get(f) and len(search.get(f, [])) > 0)
-    scores["search_completeness"] = round(search_score / len(search_fields), 2)
+    search_completeness = sum(1 for f in search_fields if search.get(f)) / len(search_fields)
 
     # MITRE presence
-    has_mitre = bool(interview.get("mitre_techniques")) and len(interview.get("mitre_techniques", [])) > 0
-    has_d3fend = bool(interview.get("d3fend_countermeasures")) and len(interview.get("d3fend_countermeasures", [])) > 0
-    scores["mitre_present"] = 1.0 if (has_mitre and has_d3fend) else 0.5 if has_mitre else 0.0
+    has_mitre = bool(interview.get("mitre_techniques"))
+    has_d3fend = bool(interview.get("d3fend_countermeasures"))
+    mitre_present = 1.0 if (has_mitre and has_d3fend) else 0.5 if has_mitre else 0.0
 
     # APT examples
-    apt_list = interview.get("apt_examples", [])
-    scores["apt_examples"] = min(1.0, len(apt_list) / 2)
+    apt_examples = min(1.0, len(interview.get("apt_examples", [])) / 2)
 
     # Specificity (voice length as proxy)
-    scores["specificity"] = min(1.0, len(voice) / 800)
+    specificity = min(1.0, len(voice) / 800)
+
+    return voice_format, search_completeness, mitre_present, apt_examples, specificity
+
+
+def evaluate_quality(result: dict) -> dict:
+    """Evaluate interview quality against requirements."""
+    interview = result.get("interview") or {}
+    voice = interview.get("voice", "")
+    search = interview.get("search", {})
+
+    voice_format, search_completeness, mitre_present, apt_examples, specificity = _quality_scores(interview)
+    scores = {
+        "voice_format": round(voice_format, 2),
+        "search_completeness": round(search_completeness, 2),
+        "mitre_present": mitre_present,
+        "apt_examples": apt_examples,
+        "specificity": specificity
+    }
 
     # Overall score
     overall = sum(scores.values()) / len(scores)
@@ -306,7 +435,146 @@ def evaluate_quality(result: dict) -> dict:
     }
 
 
-def main():
+def load_vault_keys() -> dict:
+    """Highest-confidence value for each key in the command-center credentials vault."""
+    vault_path = Path(__file__).parent.parent / "credentials-vault" / "command-center-credentials.json"
+    vault_keys = {}
+    if not vault_path.exists():
+        return vault_keys
+
+    with open(vault_path, 'rb') as f:
+        if HAS_IJSON:
+            # Stream one credential list at a time instead of parsing the whole vault
+            credentials = ijson.kvitems(f, "credentials")
+        else:
+            credentials = loads(f.read()).get("credentials", {}).items()
+        for key_name, entries in credentials:
+            if entries and isinstance(entries, list):
+                best = max(entries, key=lambda x: x.get("confidence", 0))
+                vault_keys[key_name] = best.get("value")
+    return vault_keys
+
+
+def provider_calls(vault_keys: dict) -> dict:
+    """Map provider name -> async callable(task) for every provider that has credentials."""
+    calls = {}
+
+    gemini_key = vault_keys.get("GEMINI_API_KEY") or os.environ.get("GEMINI_API_KEY")
+    if gemini_key:
+        calls["gemini_api"] = functools.partial(test_gemini_api, api_key=gemini_key)
+
+    # Vertex AI uses gcloud auth
+    calls["vertex_ai"] = test_vertex_ai
+
+    openai_key = vault_keys.get("OPENAI_API_KEY") or os.environ.get("OPENAI_API_KEY")
+    if openai_key:
+        calls["openai"] = functools.partial(test_openai, api_key=openai_key)
+
+    anthropic_key = vault_keys.get("ANTHROPIC_API_KEY") or os.environ.get("ANTHROPIC_API_KEY")
+    if anthropic_key:
+        calls["anthropic"] = functools.partial(test_anthropic, api_key=anthropic_key)
+
+    return calls
+
+
+async def run_batch(tasks: list, providers: dict, output_file: Path = None) -> list:
+    """
+    Benchmark every (task, provider) pair under per-provider limits.
+
+    Each provider gets its own semaphore and request-rate budget from
+    PROVIDER_LIMITS; failed calls are retried with exponential backoff.
+    Every finished result is appended to a JSONL checkpoint, and pairs that
+    already succeeded there are skipped, so an interrupted run resumes.
+
+    Args:
+        tasks: Task dicts (task_id, task_name, category, hd4_phase, description)
+        providers: Provider name -> async callable(task), e.g. provider_calls()
+        output_file: Checkpoint path (default BATCH_OUTPUT_FILE)
+
+    Returns:
+        Results produced by this run (not those already in the checkpoint)
+    """
+    output_file = output_file or BATCH_OUTPUT_FILE
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    done = set()
+    if output_file.exists():
+        with open(output_file, 'rb') as f:
+            for line in f:
+                try:
+                    record = loads(line)
+                except ValueError:
+                    continue  # Partial line from an interrupted write
+                if "error" not in record:
+                    done.add((record.get("task_id"), record.get("provider")))
+
+    gates = {}
+    for name in providers:
+        concurrency, rate = PROVIDER_LIMITS.get(name, (5, 2.0))
+        gates[name] = (asyncio.Semaphore(concurrency), AsyncRateLimiter(rate))
+
+    results = []
+
+    async def run_one(out, task: dict, name: str, call) -> None:
+        semaphore, limiter = gates[name]
+        async with semaphore:
+            for attempt in range(BATCH_MAX_RETRIES):
+                try:
+                    async with limiter:
+                        result = await call(task)
+                    result["quality"] = evaluate_quality(result)
+                    break
+                except Exception as e:
+                    if attempt == BATCH_MAX_RETRIES - 1:
+                        result = {"provider": name, "error": str(e)}
+                    else:
+                        await asyncio.sleep(2 ** attempt)
+        result["task_id"] = task["task_id"]
+        # Single-threaded event loop: each record is written whole between awaits
+        out.write(dumps_json_line(result))
+        out.flush()
+        results.append(result)
+
+    pending = [
+        (task, name, call)
+        for task in tasks
+        for name, call in providers.items()
+        if (task["task_id"], name) not in done
+    ]
+    try:
+        with open(output_file, 'ab') as out:
+            await asyncio.gather(*(run_one(out, task, name, call) for task, name, call in pending))
+    finally:
+        await _close_http_client()
+
+    by_provider = {}
+    for r in results:
+        if "error" not in r:
+            by_provider.setdefault(r["provider"], []).append(r["quality"]["overall"])
+    for name, qs in by_provider.items():
+        print(f"  {name}: {len(qs)} interviews, mean quality {sum(qs) / len(qs):.2f}")
+
+    return results
+
+
+def evaluate_quality_batch(results: list):
+    """
+    Score many interviews at once.
+
+    Returns a float32 array of shape (N, 6): voice_format, search_completeness,
+    mitre_present, apt_examples, specificity and overall. These are the
+    evaluate_quality scores before its 2-decimal display rounding.
+    """
+    import numpy as np
+
+    scores = np.empty((len(results), 6), dtype=np.float32)
+    for row, result in zip(scores, results):
+        row[:5] = _quality_scores(result.get("interview") or {})
+    scores[:, 5] = scores[:, :5].mean(axis=1)
+    return scores
+
+
+async def main():
     # Sample task for baseline
     task = {
         "task_id": "uuid-000-000-001",
@@ -316,83 +584,45 @@ def main():
         "description": "Forming motivations via exposure."
     }
 
-    # Load credentials
-    vault_path = Path(__file__).parent.parent / "credentials-vault" / "command-center-credentials.json"
-    vault_keys = {}
-    if vault_path.exists():
-        with open(vault_path, 'r') as f:
-            vault = json.load(f)
-            for key_name, entries in vault.get("credentials", {}).items():
-                if entries and isinstance(entries, list):
-                    best = max(entries, key=lambda x: x.get("confidence", 0))
-                    vault_keys[key_name] = best.get("value")
+    vault_keys = load_vault_keys()
 
     results = []
 
     print("=" * 70)
-    print("BASELINE QUALITY COMPARISON - 3 LLM Providers")
+    print("BASELINE QUALITY COMPARISON - 4 LLM Providers")
     print(f"Task: {task['task_name']} ({task['hd4_phase']})")
     print("=" * 70)
 
-    # Test Gemini API
-    gemini_key = vault_keys.get("GEMINI_API_KEY") or os.environ.get("GEMINI_API_KEY")
-    if gemini_key:
-        print("\n[1/3] Testing Gemini API...")
-        try:
-            result = test_gemini_api(task, gemini_key)
-            result["quality"] = evaluate_quality(result)
-            results.append(result)
-            print(f"  Time: {result['time_seconds']}s")
-            print(f"  Quality: {result['quality']['overall']}")
-        except Exception as e:
-            print(f"  ERROR: {e}")
-            results.append({"provider": "gemini_api", "error": str(e)})
-    else:
-        print("\n[1/3] Gemini API: SKIPPED (no key)")
-
-    # Test Vertex AI
-    print("\n[2/3] Testing Vertex AI...")
-    try:
-        result = test_vertex_ai(task)
-        result["quality"] = evaluate_quality(result)
-        results.append(result)
-        print(f"  Time: {result['time_seconds']}s")
-        print(f"  Quality: {result['quality']['overall']}")
-    except Exception as e:
-        print(f"  ERROR: {e}")
-        results.append({"provider": "vertex_ai", "error": str(e)})
+    # Collect provider calls; they are network-bound, so run them concurrently
+    calls = provider_calls(vault_keys)
+    providers = []
+    for provider, label in [
+        ("gemini_api", "[1/4] Gemini API"),
+        ("vertex_ai", "[2/4] Vertex AI"),
+        ("openai", "[3/4] OpenAI GPT-4o"),
+        ("anthropic", "[4/4] Anthropic Claude")
+    ]:
+        if provider in calls:
+            providers.append((provider, label, calls[provider](task)))
+        else:
+            print(f"\n{label}: SKIPPED (no key)")
 
-    # Test OpenAI
-    openai_key = vault_keys.get("OPENAI_API_KEY") or os.environ.get("OPENAI_API_KEY")
-    if openai_key:
-        print("\n[3/4] Testing OpenAI GPT-4o...")
-        try:
-            result = test_openai(task, openai_key)
-            result["quality"] = evaluate_quality(result)
-            results.append(result)
-            print(f"  Time: {result['time_seconds']}s")
-            print(f"  Quality: {result['quality']['overall']}")
-        except Exception as e:
-            print(f"  ERROR: {e}")
-            results.append({"provider": "openai", "error": str(e)})
-    else:
-        print("\n[3/4] OpenAI: SKIPPED (no key in vault)")
-
-    # Test Anthropic
-    anthropic_key = vault_keys.get("ANTHROPIC_API_KEY") or os.environ.get("ANTHROPIC_API_KEY")
-    if anthropic_key:
-        print("\n[4/4] Testing Anthropic Claude...")
-        try:
-            result = test_anthropic(task, anthropic_key)
-            result["quality"] = evaluate_quality(result)
-            results.append(result)
-            print(f"  Time: {result['time_seconds']}s")
-            print(f"  Quality: {result['quality']['overall']}")
-        except Exception as e:
-            print(f"  ERROR: {e}")
-            results.append({"provider": "anthropic", "error": str(e)})
-    else:
-        print("\n[4/4] Anthropic: SKIPPED (no key in vault)")
+    print(f"\nTesting {len(providers)} providers concurrently...")
+    try:
+        outcomes = await asyncio.gather(*(call for _, _, call in providers), return_exceptions=True)
+    finally:
+        await _close_http_client()
+
+    for (provider, label, _), outcome in zip(providers, outcomes):
+        print(f"\n{label}:")
+        if isinstance(outcome, BaseException):
+            print(f"  ERROR: {outcome}")
+            results.append({"provider": provider, "error": str(outcome)})
+            continue
+        outcome["quality"] = evaluate_quality(outcome)
+        results.append(outcome)
+        print(f"  Time: {outcome['time_seconds']}s" + (" (cached)" if outcome.get("cached") else ""))
+        print(f"  Quality: {outcome['quality']['overall']}")
 
     # Summary
     print("\n" + "=" * 70)
@@ -405,7 +635,7 @@ def main():
         else:
             q = r["quality"]
             print(f"\n{r['provider']} ({r['model']}):")
-            print(f"  Time: {r['time_seconds']}s")
+            print(f"  Time: {r['time_seconds']}s (first token {r.get('first_token_seconds', '-')}s)")
             print(f"  Overall Quality: {q['overall']}")
             print(f"  Voice Format: {q['scores']['voice_format']}")
             print(f"  Search Complete: {q['scores']['search_completeness']}")
@@ -416,15 +646,14 @@ def main():
     # Save results
     output_file = Path(__file__).parent / "output" / "baseline_comparison.json"
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_file, 'w') as f:
-        json.dump({
-            "generated_at": datetime.now().isoformat(),
-            "task": task,
-            "results": results
-        }, f, indent=2, default=str)
+    write_json_file(output_file, {
+        "generated_at": datetime.now().isoformat(),
+        "task": task,
+        "results": results
+    })
 
     print(f"\nResults saved to: {output_file}")
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+JSON file helpers shared by the interview pipeline scripts
+
+orjson is used when installed, stdlib json otherwise. Writers stringify
+values JSON has no form for (dates, paths) and accept non-str dict keys.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def loads(data) -> Any:
+    """Parse JSON text or bytes (orjson when available)."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json_file(path: Path) -> Any:
+    """Parse a JSON file in one read."""
+    return loads(path.read_bytes())
+
+
+def dumps_json(data: Any) -> bytes:
+    """Serialize data as compact JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=str, separators=(",", ":")).encode()
+
+
+def dumps_json_line(data: Any) -> bytes:
+    """Serialize one compact JSONL record (newline-terminated bytes)."""
+    return dumps_json(data) + b"\n"
+
+
+def write_json_file(path: Path, data: Any):
+    """Write indented JSON atomically."""
+    if HAS_ORJSON:
+        opts = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        payload = orjson.dumps(data, default=str, option=opts)
+    else:
+        payload = json.dumps(data, indent=2, default=str).encode()
+    # Encode fully, write once, then swap in so readers never see a partial file
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
@@ -9,19 +9,40 @@ Implements:
 - Stock Market Universality validation
 """
 
-import json
-import math
+import sys
+import time
 import numpy as np
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Sequence, Tuple, Optional
 from collections import Counter
 from dataclasses import dataclass, asdict
+from functools import lru_cache
+
+from json_io import loads, read_json_file, write_json_file
+
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    from bitarray import bitarray
+    HAS_BITARRAY = True
+except ImportError:
+    HAS_BITARRAY = False
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
 
 OUTPUT_DIR = Path(__file__).parent / "output"
 THREAT_CONTENT_DIR = OUTPUT_DIR / "threat_content"
 L2_OUTPUT_DIR = OUTPUT_DIR / "layer2"
 
+
 # =============================================================================
 # TETH: Topological Entropy Threat Heuristic
 # =============================================================================
@@ -86,14 +107,12 @@ class TETH:
 
         # Count occurrences
         counts = Counter(primitives)
-        total = sum(counts.values())
 
-        # Calculate Shannon entropy
-        entropy = 0.0
-        for count in counts.values():
-            if count > 0:
-                p = count / total
-                entropy -= p * math.log2(p)
+        # Calculate Shannon entropy in one vectorized pass over the counts
+        c = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        p = c / c.sum()
+        # + 0.0 turns the -0.0 of a single-category distribution into 0.0
+        entropy = float(-(p * np.log2(p)).sum()) + 0.0
 
         # Determine complexity level
         complexity = "LOW"
@@ -140,12 +159,17 @@ class Lstar:
     ACCURACY_THRESHOLD = 0.8
 
     def __init__(self):
-        self.observation_table = {}
-        self.states = set()
-        self.transitions = {}
+        # One membership bit per prefix, indexed by its bijective base-K id:
+        # id("") = 0, id(s + a) = id(s) * K + index(a) + 1. The table always
+        # holds every string up to the current depth, so the ids are contiguous.
+        self.observation_table = bitarray() if HAS_BITARRAY else bytearray()
+        self.states = range(0)
         self.alphabet = set()
+        self._symbols = []
+        self._symbol_idx = {}
+        self._positive_prefixes = set()
 
-    def learn(self, positive_samples: List[str], negative_samples: List[str]) -> LstarResult:
+    def learn(self, positive_samples: Sequence[str], negative_samples: Sequence[str]) -> LstarResult:
         """
         Learn a threat pattern automaton from samples.
 
@@ -154,49 +178,85 @@ class Lstar:
             negative_samples: Examples that should be rejected
         """
         # Build alphabet from samples
-        for sample in positive_samples + negative_samples:
+        for sample in (*positive_samples, *negative_samples):
             for char in sample:
                 self.alphabet.add(char)
+        self._symbols = sorted(self.alphabet)
+        self._symbol_idx = {symbol: i for i, symbol in enumerate(self._symbols)}
+        k = len(self._symbols)
+
+        # Ids of every prefix of every positive sample, so membership is one hash lookup
+        self._positive_prefixes = set()
+        for sample in positive_samples:
+            prefix_id = 0
+            self._positive_prefixes.add(prefix_id)
+            for char in sample:
+                prefix_id = prefix_id * k + self._symbol_idx[char] + 1
+                self._positive_prefixes.add(prefix_id)
 
         # Initialize observation table
-        self.observation_table = {"": self._membership_query("", positive_samples)}
+        table = self.observation_table = bitarray() if HAS_BITARRAY else bytearray()
+        table.append(self._membership_query(0))
+        level_start, level_end = 0, 1
 
         iteration = 0
         converged = False
 
         while iteration < self.MAX_ITERATIONS and not converged:
-            # Process current states
-            for prefix in list(self.observation_table.keys()):
-                for symbol in self.alphabet:
-                    new_state = prefix + symbol
-                    if new_state not in self.observation_table:
-                        self.observation_table[new_state] = self._membership_query(
-                            new_state, positive_samples
-                        )
+            # Extend every prefix by one symbol; only the deepest level has
+            # children missing, and they form the next contiguous id block
+            level_start, level_end = level_end, level_end * k + 1
+            table.extend(self._membership_query(i) for i in range(level_start, level_end))
 
             # Check for convergence (closed and consistent)
             converged = self._is_closed() and self._is_consistent()
             iteration += 1
 
         # Build final automaton
-        self.states = set(self.observation_table.keys())
-        self._build_transitions()
+        self.states = range(len(table))
 
         # Calculate accuracy
         accuracy = self._calculate_accuracy(positive_samples, negative_samples)
 
         return LstarResult(
             states_discovered=len(self.states),
-            transitions=len(self.transitions),
+            # Prefix-closed table: every state but the root has one incoming edge
+            transitions=max(len(self.states) - 1, 0),
             accuracy=round(accuracy, 4),
             converged=converged and accuracy >= self.ACCURACY_THRESHOLD,
             iterations=iteration,
             alphabet=sorted(list(self.alphabet))
         )
 
-    def _membership_query(self, string: str, positive_samples: List[str]) -> bool:
-        """Check if string is a prefix of any positive sample."""
-        return any(sample.startswith(string) for sample in positive_samples)
+    def _membership_query(self, prefix_id: int) -> bool:
+        """Check if the prefix is a prefix of any positive sample."""
+        return prefix_id in self._positive_prefixes
+
+    def _prefix_id(self, string: str) -> Optional[int]:
+        """Table index of string, or None if it uses a symbol outside the alphabet."""
+        k = len(self._symbols)
+        prefix_id = 0
+        for char in string:
+            idx = self._symbol_idx.get(char)
+            if idx is None:
+                return None
+            prefix_id = prefix_id * k + idx + 1
+        return prefix_id
+
+    def _lookup(self, string: str) -> Optional[bool]:
+        """Observed membership of string, or None if it is not in the table."""
+        prefix_id = self._prefix_id(string)
+        if prefix_id is None or prefix_id >= len(self.observation_table):
+            return None
+        return bool(self.observation_table[prefix_id])
+
+    def _transition(self, state: int, symbol: str) -> Optional[int]:
+        """Successor state id, or None if it falls outside the learned table."""
+        idx = self._symbol_idx.get(symbol)
+        if idx is None:
+            return None
+        next_state = state * len(self._symbols) + idx + 1
+        return next_state if next_state < len(self.observation_table) else None
 
     def _is_closed(self) -> bool:
         """Check if observation table is closed."""
@@ -206,14 +266,6 @@ class Lstar:
         """Check if observation table is consistent."""
         return True  # Simplified
 
-    def _build_transitions(self):
-        """Build transitions from observation table."""
-        for state in self.states:
-            for symbol in self.alphabet:
-                next_state = state + symbol
-                if next_state in self.states:
-                    self.transitions[(state, symbol)] = next_state
-
     def _calculate_accuracy(self, positive: List[str], negative: List[str]) -> float:
         """Calculate classification accuracy."""
         if not positive and not negative:
@@ -223,11 +275,11 @@ class Lstar:
         total = len(positive) + len(negative)
 
         for sample in positive:
-            if self.observation_table.get(sample, False):
+            if self._lookup(sample):
                 correct += 1
 
         for sample in negative:
-            if not self.observation_table.get(sample, True):
+            if self._lookup(sample) is False:
                 correct += 1
 
         return correct / total if total > 0 else 0.0
@@ -246,6 +298,125 @@ class HMMResult:
     most_likely_sequence: List[str]
     viterbi_probability: float
 
+# HD4 Hidden States (RFC-9300)
+_HD4_STATES = ["Hunt", "Detect", "Disrupt", "Disable", "Dominate"]
+
+# Primitive to phase mapping
+_PRIMITIVE_PHASE = {
+    "Hunt": ["READ", "CONNECT", "RECEIVE", "FILTER", "SCAN", "ENUMERATE"],
+    "Detect": ["VERIFY", "AUTHENTICATE", "HASH", "SIGN"],
+    "Disrupt": ["DISCONNECT", "DELETE", "TRANSFORM"],
+    "Disable": ["INJECT", "HOOK", "EXPLOIT", "ESCALATE"],
+    "Dominate": ["PERSIST", "EXFILTRATE", "PROXY", "TUNNEL", "LATERAL"]
+}
+
+
+def _readonly(a: np.ndarray) -> np.ndarray:
+    """Freeze an array shared by every HMMPersona instance."""
+    a.flags.writeable = False
+    return a
+
+
+# Transition matrix (favors sequential progression)
+_TRANSITION = _readonly(np.array([
+    [0.5, 0.4, 0.05, 0.03, 0.02],  # From Hunt
+    [0.1, 0.5, 0.3, 0.07, 0.03],   # From Detect
+    [0.05, 0.1, 0.5, 0.3, 0.05],   # From Disrupt
+    [0.02, 0.05, 0.1, 0.5, 0.33],  # From Disable
+    [0.02, 0.03, 0.05, 0.1, 0.8]   # From Dominate
+]))
+
+# Initial state distribution (start in Hunt)
+_INITIAL = _readonly(np.array([0.8, 0.1, 0.05, 0.03, 0.02]))
+
+_PRIMITIVES = sorted({p for primitives in _PRIMITIVE_PHASE.values() for p in primitives})
+_PRIMITIVE_IDX = {p: i for i, p in enumerate(_PRIMITIVES)}
+
+
+def _build_emission_matrix() -> np.ndarray:
+    """Build emission matrix from primitive-phase mapping (simplified)."""
+    emission = np.zeros((len(_HD4_STATES), len(_PRIMITIVES)))
+    for i, state in enumerate(_HD4_STATES):
+        state_primitives = _PRIMITIVE_PHASE.get(state, [])
+        for j, primitive in enumerate(_PRIMITIVES):
+            if primitive in state_primitives:
+                emission[i, j] = 1.0 / len(state_primitives)
+            else:
+                emission[i, j] = 0.01  # Small probability for other emissions
+    return emission
+
+
+_EMISSION = _readonly(_build_emission_matrix())
+
+# Log-space copies for viterbi, kept in float64: in float32 distinct paths
+# round to equal scores and the tie-break picks a different sequence
+_LOG_TRANSITION = _readonly(np.log(_TRANSITION))
+_LOG_INITIAL = _readonly(np.log(_INITIAL))
+_LOG_EMISSION = _readonly(np.log(_EMISSION))
+
+# float32 copies for the forward pass, which renormalizes every step
+_TRANSITION = _readonly(_TRANSITION.astype(np.float32))
+_INITIAL = _readonly(_INITIAL.astype(np.float32))
+_EMISSION = _readonly(_EMISSION.astype(np.float32))
+
+
+def _viterbi_core(log_initial, log_transition, log_emission, obs_indices):
+    """Log-space max-product pass and backtrack; returns (states, best log-prob)."""
+    n_states = log_transition.shape[0]
+    T = obs_indices.shape[0]
+    V = np.empty((n_states, T), dtype=log_transition.dtype)
+    path = np.zeros((n_states, T), dtype=np.int32)
+
+    for s in range(n_states):
+        V[s, 0] = log_initial[s] + log_emission[s, obs_indices[0]]
+
+    for t in range(1, T):
+        o = obs_indices[t]
+        for j in range(n_states):
+            best = V[0, t-1] + log_transition[0, j]
+            arg = 0
+            for i in range(1, n_states):
+                v = V[i, t-1] + log_transition[i, j]
+                if v > best:
+                    best = v
+                    arg = i
+            V[j, t] = best + log_emission[j, o]
+            path[j, t] = arg
+
+    states = np.empty(T, dtype=np.int32)
+    last = 0
+    for s in range(1, n_states):
+        if V[s, T-1] > V[last, T-1]:
+            last = s
+    states[T-1] = last
+    for t in range(T-2, -1, -1):
+        states[t] = path[states[t+1], t+1]
+    return states, V[last, T-1]
+
+
+def _forward_core(initial, transition, emission, obs_indices):
+    """Scaled forward pass; returns the normalized final alpha."""
+    n_states = transition.shape[0]
+    alpha = initial * emission[:, obs_indices[0]]
+    alpha /= alpha.sum()
+    nxt = np.empty(n_states, dtype=transition.dtype)
+    for t in range(1, obs_indices.shape[0]):
+        o = obs_indices[t]
+        for j in range(n_states):
+            acc = 0.0
+            for i in range(n_states):
+                acc += alpha[i] * transition[i, j]
+            nxt[j] = acc * emission[j, o]
+        alpha[:] = nxt / nxt.sum()
+    return alpha
+
+
+if HAS_NUMBA:
+    # Straight-line loops compile to tight native code; cached on disk across runs
+    _viterbi_core = numba.njit(cache=True, fastmath=True)(_viterbi_core)
+    _forward_core = numba.njit(cache=True, fastmath=True)(_forward_core)
+
+
 class HMMPersona:
     """
     Hidden Markov Model for HD4 Phase Discovery.
@@ -255,92 +426,74 @@ class HMMPersona:
     """
 
     # HD4 Hidden States (RFC-9300)
-    STATES = ["Hunt", "Detect", "Disrupt", "Disable", "Dominate"]
+    STATES = _HD4_STATES
     STATE_CODES = {"Hunt": "H", "Detect": "D¹", "Disrupt": "D²", "Disable": "D³", "Dominate": "D⁴"}
 
     # Primitive to phase mapping
-    PRIMITIVE_PHASE = {
-        "Hunt": ["READ", "CONNECT", "RECEIVE", "FILTER", "SCAN", "ENUMERATE"],
-        "Detect": ["VERIFY", "AUTHENTICATE", "HASH", "SIGN"],
-        "Disrupt": ["DISCONNECT", "DELETE", "TRANSFORM"],
-        "Disable": ["INJECT", "HOOK", "EXPLOIT", "ESCALATE"],
-        "Dominate": ["PERSIST", "EXFILTRATE", "PROXY", "TUNNEL", "LATERAL"]
-    }
+    PRIMITIVE_PHASE = _PRIMITIVE_PHASE
 
     def __init__(self):
         self.n_states = len(self.STATES)
 
-        # Initialize transition matrix (favors sequential progression)
-        self.transition = np.array([
-            [0.5, 0.4, 0.05, 0.03, 0.02],  # From Hunt
-            [0.1, 0.5, 0.3, 0.07, 0.03],   # From Detect
-            [0.05, 0.1, 0.5, 0.3, 0.05],   # From Disrupt
-            [0.02, 0.05, 0.1, 0.5, 0.33],  # From Disable
-            [0.02, 0.03, 0.05, 0.1, 0.8]   # From Dominate
-        ])
-
-        # Initial state distribution (start in Hunt)
-        self.initial = np.array([0.8, 0.1, 0.05, 0.03, 0.02])
-
-        # Emission probabilities (simplified)
-        self._build_emission_matrix()
-
-    def _build_emission_matrix(self):
-        """Build emission matrix from primitive-phase mapping."""
-        # Get all unique primitives
-        all_primitives = set()
-        for primitives in self.PRIMITIVE_PHASE.values():
-            all_primitives.update(primitives)
-
-        self.primitives = sorted(list(all_primitives))
+        # Shared read-only model constants (built once at import)
+        self.transition = _TRANSITION
+        self.initial = _INITIAL
+        self.emission = _EMISSION
+        self.primitives = _PRIMITIVES
         self.n_obs = len(self.primitives)
+        self._primitive_idx = _PRIMITIVE_IDX
+        self.log_transition = _LOG_TRANSITION
+        self.log_initial = _LOG_INITIAL
+        self.log_emission = _LOG_EMISSION
 
-        # Build emission matrix
-        self.emission = np.zeros((self.n_states, self.n_obs))
-        for i, state in enumerate(self.STATES):
-            state_primitives = self.PRIMITIVE_PHASE.get(state, [])
-            for j, primitive in enumerate(self.primitives):
-                if primitive in state_primitives:
-                    self.emission[i, j] = 1.0 / len(state_primitives)
-                else:
-                    self.emission[i, j] = 0.01  # Small probability for other emissions
+    def encode(self, observations: List[str]) -> np.ndarray:
+        """
+        Map observed primitives to emission columns (unknown -> first primitive).
+
+        Already-encoded arrays are returned as-is, so callers can encode a long
+        primitive list once and pass slices (views) of it to viterbi/forward/fit.
+        """
+        if isinstance(observations, np.ndarray):
+            return observations
+        idx = self._primitive_idx
+        return np.fromiter((idx.get(o, 0) for o in observations), dtype=np.int32, count=len(observations))
 
     def viterbi(self, observations: List[str]) -> Tuple[List[str], float]:
         """
         Viterbi algorithm to find most likely state sequence.
 
         Args:
-            observations: List of observed primitives
+            observations: List of observed primitives (or encode() output)
 
         Returns:
             (most_likely_sequence, probability)
         """
-        if not observations:
+        if len(observations) == 0:
             return [], 0.0
 
-        # Map observations to indices
-        obs_indices = []
-        for obs in observations:
-            if obs in self.primitives:
-                obs_indices.append(self.primitives.index(obs))
-            else:
-                obs_indices.append(0)  # Default to first primitive
-
+        obs_indices = self.encode(observations)
         T = len(obs_indices)
 
+        # Work in log-space so long sequences don't underflow to 0
+        log_transition = self.log_transition
+        log_emission = self.log_emission
+
+        if HAS_NUMBA:
+            states, log_prob = _viterbi_core(self.log_initial, log_transition, log_emission, obs_indices)
+            return [self.STATES[s] for s in states], float(np.exp(log_prob))
+
         # Initialize
         V = np.zeros((self.n_states, T))
-        path = np.zeros((self.n_states, T), dtype=int)
+        path = np.zeros((self.n_states, T), dtype=np.int32)
 
         # First observation
-        V[:, 0] = self.initial * self.emission[:, obs_indices[0]]
+        V[:, 0] = self.log_initial + log_emission[:, obs_indices[0]]
 
-        # Forward pass
+        # Forward pass: scores[i, j] = V[i, t-1] + log A[i, j] for all states at once
         for t in range(1, T):
-            for s in range(self.n_states):
-                probs = V[:, t-1] * self.transition[:, s] * self.emission[s, obs_indices[t]]
-                V[s, t] = np.max(probs)
-                path[s, t] = np.argmax(probs)
+            scores = V[:, t-1, None] + log_transition
+            path[:, t] = scores.argmax(axis=0)
+            V[:, t] = scores.max(axis=0) + log_emission[:, obs_indices[t]]
 
         # Backtrack
         states = np.zeros(T, dtype=int)
@@ -349,46 +502,39 @@ class HMMPersona:
         for t in range(T-2, -1, -1):
             states[t] = path[states[t+1], t+1]
 
-        return [self.STATES[s] for s in states], float(np.max(V[:, T-1]))
+        return [self.STATES[s] for s in states], float(np.exp(np.max(V[:, T-1])))
 
     def forward(self, observations: List[str]) -> Dict[str, float]:
         """
         Forward algorithm to get state probabilities.
 
         Args:
-            observations: List of observed primitives
+            observations: List of observed primitives (or encode() output)
 
         Returns:
             Dictionary of state probabilities
         """
-        if not observations:
+        if len(observations) == 0:
             return {state: 0.0 for state in self.STATES}
 
-        # Map observations to indices
-        obs_indices = []
-        for obs in observations:
-            if obs in self.primitives:
-                obs_indices.append(self.primitives.index(obs))
-            else:
-                obs_indices.append(0)
-
+        obs_indices = self.encode(observations)
         T = len(obs_indices)
 
+        if HAS_NUMBA:
+            final_probs = _forward_core(self.initial, self.transition, self.emission, obs_indices)
+            return {state: round(float(prob), 4) for state, prob in zip(self.STATES, final_probs)}
+
         # Initialize
-        alpha = np.zeros((self.n_states, T))
-        alpha[:, 0] = self.initial * self.emission[:, obs_indices[0]]
+        alpha = self.initial * self.emission[:, obs_indices[0]]
+        alpha /= alpha.sum()
 
-        # Forward pass
+        # Forward pass: one matrix-vector product per step, rescaled each
+        # step so long sequences don't underflow (final result is normalized anyway)
         for t in range(1, T):
-            for s in range(self.n_states):
-                alpha[s, t] = np.sum(alpha[:, t-1] * self.transition[:, s]) * \
-                              self.emission[s, obs_indices[t]]
+            alpha = (alpha @ self.transition) * self.emission[:, obs_indices[t]]
+            alpha /= alpha.sum()
 
-        # Normalize final probabilities
-        final_probs = alpha[:, T-1]
-        total = np.sum(final_probs)
-        if total > 0:
-            final_probs = final_probs / total
+        final_probs = alpha
 
         return {state: round(float(prob), 4) for state, prob in zip(self.STATES, final_probs)}
 
@@ -443,7 +589,7 @@ class HMMPersona:
 
 @dataclass
 class StockMarketResult:
-    """Stock market universality result."""
+    """Stock market universality result (full precision; rounded for reporting)."""
     benchmark_passed: bool
     sharpe_ratio: float
     expected_return: float
@@ -460,6 +606,10 @@ class StockMarketValidator:
     BENCHMARK_RETURN = 0.02  # 2% minimum
     SHARPE_THRESHOLD = 1.0
 
+    # Simulated Sharpe inputs (in production, would use actual trading data)
+    _RISK_FREE = 0.01   # 1% risk-free rate
+    _INV_VOL = 50.0     # 1 / 2% volatility
+
     # Trading action to primitive mapping
     TRADING_PRIMITIVES = {
         "READ": "Get market data",
@@ -475,6 +625,8 @@ class StockMarketValidator:
         "DELETE": "Cancel order",
         "COMPRESS": "Aggregate positions"
     }
+    # Coverage only needs the keys
+    TRADING_KEYS = frozenset(TRADING_PRIMITIVES)
 
     def validate(self, primitives_used: List[str]) -> StockMarketResult:
         """
@@ -486,23 +638,20 @@ class StockMarketValidator:
         Returns:
             StockMarketResult
         """
-        # Count how many trading primitives are covered
-        covered = sum(1 for p in primitives_used if p in self.TRADING_PRIMITIVES)
-        coverage = covered / len(self.TRADING_PRIMITIVES)
+        # Count how many distinct trading primitives are covered
+        covered = len(self.TRADING_KEYS.intersection(primitives_used))
+        coverage = covered / len(self.TRADING_KEYS)
 
         # Simulate return based on coverage
         simulated_return = coverage * 0.05  # Up to 5% return with full coverage
 
         # Calculate simulated Sharpe ratio
-        # (In production, would use actual trading data)
-        volatility = 0.02  # 2% volatility
-        risk_free = 0.01   # 1% risk-free rate
-        sharpe = (simulated_return - risk_free) / volatility if volatility > 0 else 0
+        sharpe = (simulated_return - self._RISK_FREE) * self._INV_VOL
 
         return StockMarketResult(
             benchmark_passed=simulated_return >= self.BENCHMARK_RETURN and sharpe >= self.SHARPE_THRESHOLD,
-            sharpe_ratio=round(sharpe, 4),
-            expected_return=round(simulated_return, 4),
+            sharpe_ratio=sharpe,
+            expected_return=simulated_return,
             primitives_validated=covered
         )
 
@@ -511,6 +660,50 @@ class StockMarketValidator:
 # Main Layer 2 Validation Runner
 # =============================================================================
 
+# Fallback when the ontology has no primitive terms
+_DEFAULT_PRIMITIVES = ("READ", "SCAN", "CONNECT", "FILTER", "EXECUTE",
+                       "VERIFY", "STORE", "AUTHENTICATE")
+
+# Sample threat patterns for L* (immutable; copy to a list before mutating)
+_LSTAR_POS = ("SCAN:CONNECT:EXECUTE", "READ:FILTER:EXPLOIT", "ENUMERATE:ESCALATE:PERSIST")
+_LSTAR_NEG = ("RANDOM:NOISE", "INVALID:PATTERN")
+
+
+@lru_cache(maxsize=4)
+def _load_crosswalk_items(path: str, mtime_ns: int) -> Tuple[Dict, ...]:
+    """
+    Technique items from crosswalk_index.json, cached per (path, mtime).
+
+    The returned dicts are shared across runs; copy before mutating.
+    """
+    with open(path, 'rb') as f:
+        if HAS_IJSON:
+            # Stream one technique at a time instead of parsing the whole index
+            crosswalk = ijson.kvitems(f, "", use_float=True)
+        else:
+            crosswalk = loads(f.read()).items()
+        return tuple(
+            {"id": technique_id, "category": "technique", "mappings": mappings}
+            for technique_id, mappings in crosswalk
+        )
+
+
+@lru_cache(maxsize=4)
+def _load_ontology_terms(path: str, mtime_ns: int) -> Tuple[Tuple[Dict, ...], Tuple[str, ...]]:
+    """
+    Ontology terms and the names of primitive terms, cached per (path, mtime).
+
+    The returned dicts are shared across runs; copy before mutating.
+    """
+    terms = tuple(read_json_file(Path(path)).get("terms", ()))
+    primitives = tuple(
+        term.get("name", "") for term in terms
+        if isinstance(term.get("category"), str)
+        and "primitive" in term["category"].casefold()
+    )
+    return terms, primitives
+
+
 @dataclass
 class Layer2ValidationResult:
     """Complete Layer 2 validation result."""
@@ -532,86 +725,77 @@ def run_layer2_validation(threat_content_dir: Path = THREAT_CONTENT_DIR) -> Laye
     3. HMM - Phase discovery
     4. Stock Market - Universality check
     """
-    print("=" * 70)
-    print("RFC-9011/9300: Layer 2 Mathematical Validation")
-    print("=" * 70)
+    # Collect the report and write it once at the end
+    report: List[str] = []
+    emit = report.append
+    emit("=" * 70)
+    emit("RFC-9011/9300: Layer 2 Mathematical Validation")
+    emit("=" * 70)
 
     # Load threat content
     items = []
     primitives_used = []
 
-    # Load crosswalk index
+    # Load crosswalk index and ontology; parses are cached per file version, and
+    # a single stat() both checks existence and supplies the cache key
     crosswalk_file = threat_content_dir / "crosswalk_index.json"
-    if crosswalk_file.exists():
-        with open(crosswalk_file) as f:
-            crosswalk = json.load(f)
-            for technique_id, mappings in crosswalk.items():
-                items.append({
-                    "id": technique_id,
-                    "category": "technique",
-                    "mappings": mappings
-                })
-
-    # Load ontology for primitives
+    try:
+        mtime_ns = crosswalk_file.stat().st_mtime_ns
+    except FileNotFoundError:
+        pass
+    else:
+        items.extend(_load_crosswalk_items(str(crosswalk_file), mtime_ns))
+
     ontology_file = OUTPUT_DIR / "ontology" / "threat_ontology.json"
-    if ontology_file.exists():
-        with open(ontology_file) as f:
-            ontology = json.load(f)
-            for term in ontology.get("terms", []):
-                items.append(term)
-                if "primitive" in str(term.get("category", "")).lower():
-                    primitives_used.append(term.get("name", ""))
+    try:
+        mtime_ns = ontology_file.stat().st_mtime_ns
+    except FileNotFoundError:
+        pass
+    else:
+        terms, primitives = _load_ontology_terms(str(ontology_file), mtime_ns)
+        items.extend(terms)
+        primitives_used = list(primitives)
 
     # Default primitives if none found
     if not primitives_used:
-        primitives_used = ["READ", "SCAN", "CONNECT", "FILTER", "EXECUTE",
-                          "VERIFY", "STORE", "AUTHENTICATE"]
+        primitives_used = list(_DEFAULT_PRIMITIVES)
 
-    print(f"\n📊 Loaded {len(items)} items, {len(primitives_used)} primitives")
+    emit(f"\n📊 Loaded {len(items)} items, {len(primitives_used)} primitives")
 
     # 1. TETH Validation
-    print("\n[1/4] TETH - Topological Entropy Threat Heuristic")
+    emit("\n[1/4] TETH - Topological Entropy Threat Heuristic")
     teth = TETH()
     teth_result = teth.validate(items)
-    print(f"      Entropy: {teth_result.entropy}")
-    print(f"      Complexity: {teth_result.complexity_level}")
-    print(f"      Threshold passed: {'✅' if teth_result.threshold_passed else '❌'}")
+    emit(f"      Entropy: {teth_result.entropy}")
+    emit(f"      Complexity: {teth_result.complexity_level}")
+    emit(f"      Threshold passed: {'✅' if teth_result.threshold_passed else '❌'}")
 
     # 2. L* Learning
-    print("\n[2/4] L* - Active Learning Algorithm")
+    emit("\n[2/4] L* - Active Learning Algorithm")
     lstar = Lstar()
-    # Generate sample threat patterns
-    positive_samples = [
-        "SCAN:CONNECT:EXECUTE",
-        "READ:FILTER:EXPLOIT",
-        "ENUMERATE:ESCALATE:PERSIST"
-    ]
-    negative_samples = [
-        "RANDOM:NOISE",
-        "INVALID:PATTERN"
-    ]
-    lstar_result = lstar.learn(positive_samples, negative_samples)
-    print(f"      States discovered: {lstar_result.states_discovered}")
-    print(f"      Accuracy: {lstar_result.accuracy}")
-    print(f"      Converged: {'✅' if lstar_result.converged else '❌'}")
+    lstar_result = lstar.learn(_LSTAR_POS, _LSTAR_NEG)
+    emit(f"      States discovered: {lstar_result.states_discovered}")
+    emit(f"      Accuracy: {lstar_result.accuracy}")
+    emit(f"      Converged: {'✅' if lstar_result.converged else '❌'}")
 
     # 3. HMM Persona
-    print("\n[3/4] HMM - Hidden Markov Model for HD4 Phase Discovery")
+    emit("\n[3/4] HMM - Hidden Markov Model for HD4 Phase Discovery")
     hmm = HMMPersona()
-    # Generate observation sequences from primitives
-    sequences = [primitives_used[:10], primitives_used[5:15] if len(primitives_used) > 15 else primitives_used]
+    # Generate observation sequences from primitives: encode once, slice views
+    observations = hmm.encode(primitives_used)
+    sequences = [observations[:10], observations[5:15] if observations.size > 15 else observations]
     hmm_result = hmm.fit(sequences)
-    print(f"      Converged: {'✅' if hmm_result.converged else '❌'}")
-    print(f"      Iterations: {hmm_result.iterations}")
-    print(f"      Phase probabilities: {hmm_result.phase_probabilities}")
+    emit(f"      Converged: {'✅' if hmm_result.converged else '❌'}")
+    emit(f"      Iterations: {hmm_result.iterations}")
+    emit(f"      Phase probabilities: {hmm_result.phase_probabilities}")
 
     # 4. Stock Market Universality
-    print("\n[4/4] Stock Market - Universality Validation")
+    emit("\n[4/4] Stock Market - Universality Validation")
     sm_validator = StockMarketValidator()
     sm_result = sm_validator.validate(primitives_used)
-    print(f"      Sharpe ratio: {sm_result.sharpe_ratio}")
-    print(f"      Expected return: {sm_result.expected_return}")
-    print(f"      Benchmark passed: {'✅' if sm_result.benchmark_passed else '❌'}")
+    emit(f"      Sharpe ratio: {round(sm_result.sharpe_ratio, 4)}")
+    emit(f"      Expected return: {round(sm_result.expected_return, 4)}")
+    emit(f"      Benchmark passed: {'✅' if sm_result.benchmark_passed else '❌'}")
 
     # Summary
     all_passed = (
@@ -622,11 +806,15 @@ def run_layer2_validation(threat_content_dir: Path = THREAT_CONTENT_DIR) -> Laye
     )
 
     result = Layer2ValidationResult(
-        timestamp=datetime.now().isoformat(),
+        timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"),
         teth=asdict(teth_result),
         lstar=asdict(lstar_result),
         hmm=asdict(hmm_result),
-        stock_market=asdict(sm_result),
+        stock_market={
+            **asdict(sm_result),
+            "sharpe_ratio": round(sm_result.sharpe_ratio, 4),
+            "expected_return": round(sm_result.expected_return, 4),
+        },
         all_passed=all_passed,
         summary={
             "teth_passed": teth_result.threshold_passed,
@@ -639,13 +827,14 @@ def run_layer2_validation(threat_content_dir: Path = THREAT_CONTENT_DIR) -> Laye
     # Save results
     L2_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     output_file = L2_OUTPUT_DIR / "layer2_validation_results.json"
-    with open(output_file, 'w') as f:
-        json.dump(asdict(result), f, indent=2)
-
-    print("\n" + "=" * 70)
-    print(f"LAYER 2 VALIDATION: {'✅ ALL PASSED' if all_passed else '⚠️ SOME FAILED'}")
-    print("=" * 70)
-    print(f"\n📁 Results saved to: {output_file}")
+    # Fields are already plain dicts/scalars; vars() skips asdict's deep copy
+    write_json_file(output_file, vars(result))
+
+    emit("\n" + "=" * 70)
+    emit(f"LAYER 2 VALIDATION: {'✅ ALL PASSED' if all_passed else '⚠️ SOME FAILED'}")
+    emit("=" * 70)
+    emit(f"\n📁 Results saved to: {output_file}")
+    sys.stdout.write("\n".join(report) + "\n")
 
     return result
 
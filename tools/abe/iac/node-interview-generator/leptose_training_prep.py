@@ -16,28 +16,152 @@ Usage:
     python leptose_training_prep.py --format phi3 --input output/threat_content
 """
 
-import json
 import argparse
+import hashlib
+import os
 import logging
 import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field, asdict
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Any
+from dataclasses import dataclass, field
+
+from json_io import dumps_json, dumps_json_line, loads, write_json_file
 
 try:
     import yaml
     HAS_YAML = True
+    # libyaml-backed loader is an order of magnitude faster than pure Python
+    try:
+        from yaml import CSafeLoader as SafeLoader
+        HAS_LIBYAML = True
+    except ImportError:
+        from yaml import SafeLoader
+        HAS_LIBYAML = False
 except ImportError:
     HAS_YAML = False
+    HAS_LIBYAML = False
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+if HAS_YAML and not HAS_LIBYAML:
+    logger.warning("PyYAML built without libyaml; YAML parsing will be slow "
+                   "(install libyaml and reinstall PyYAML for CSafeLoader)")
+
 OUTPUT_DIR = Path(__file__).parent / "output"
 
 # ATL-Physical training data path (invisible operationally, included in training)
 ATL_PHYSICAL_PATH = Path(__file__).parent.parent.parent / "ctas-dir" / "20-atl" / "physical" / "data" / "atl_physical_ied.yaml"
 
+# Parsed YAML cached as JSON, invalidated by source mtime/size
+YAML_CACHE_DIR = OUTPUT_DIR / "yaml_cache"
+
+# Below this many rule files, process start-up costs more than parallel parsing saves
+RULE_PARSE_MIN_FILES = 64
+
+# ATT&CK dumps at least this large are streamed with ijson instead of parsed whole
+STREAM_PARSE_MIN_BYTES = 100 << 20
+
+
+def _write_jsonl(path: Path, samples: Iterable[Dict]) -> int:
+    """Stream samples to JSONL through a 1 MiB buffer; returns the record count."""
+    count = 0
+    with open(path, "wb", buffering=1 << 20) as f:
+        write = f.write
+        for sample in samples:
+            write(dumps_json_line(sample))
+            count += 1
+    return count
+
+
+def _read_yaml_cache(cache_path: Path, source_key: list):
+    """Return cached data if cache_path was built from source_key, else None."""
+    try:
+        cached = loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if cached.get("source") != source_key:
+        return None
+    return cached["data"]
+
+
+def _write_yaml_cache(cache_path: Path, source_key: list, data):
+    """Store data in the cache and return it as a cache hit would (JSON types only)."""
+    # default=str: YAML dates/timestamps have no JSON form; YAML also allows
+    # non-string keys, which stdlib json stringifies
+    record = {"source": source_key, "data": data}
+    payload = dumps_json(record)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_bytes(payload)
+    return loads(payload)["data"]
+
+
+def _load_cached_yaml(path: Path, cache_path: Path):
+    """Parse a YAML file, reusing the JSON cache while the file is unchanged."""
+    st = path.stat()
+    source_key = [st.st_mtime_ns, st.st_size]
+    data = _read_yaml_cache(cache_path, source_key)
+    if data is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = _write_yaml_cache(cache_path, source_key, yaml.load(f, Loader=SafeLoader))
+    return data
+
+
+def _parse_rule_file(rule_file: Path) -> Optional[Dict]:
+    """Parse one Sigma rule file; None if unreadable or invalid (process-pool worker)."""
+    try:
+        with open(rule_file, 'rb') as f:
+            return yaml.load(f, Loader=SafeLoader)
+    except Exception:
+        return None
+
+
+def _load_cached_rules(rules_dir: Path) -> List[Dict]:
+    """Parse every Sigma rule under rules_dir, cached as one JSON file per directory.
+
+    The cache is keyed on (relative path, mtime, size) of every *.yml file, so
+    adding, removing or editing any rule re-parses the tree.
+    """
+    rule_files = list(rules_dir.glob("**/*.yml"))
+    source_key = []
+    for rule_file in rule_files:
+        st = rule_file.stat()
+        source_key.append([str(rule_file.relative_to(rules_dir)), st.st_mtime_ns, st.st_size])
+
+    dir_hash = hashlib.sha1(str(rules_dir.resolve()).encode()).hexdigest()[:12]
+    cache_path = YAML_CACHE_DIR / f"sigma_rules-{dir_hash}.json"
+    rules = _read_yaml_cache(cache_path, source_key)
+    if rules is None:
+        # Files are independent: spread the parse across cores when there are enough
+        if len(rule_files) >= RULE_PARSE_MIN_FILES:
+            with ProcessPoolExecutor() as pool:
+                parsed = list(pool.map(_parse_rule_file, rule_files, chunksize=32))
+        else:
+            parsed = map(_parse_rule_file, rule_files)
+        rules = _write_yaml_cache(cache_path, source_key, [rule for rule in parsed if rule])
+    return rules
+
+
+def _load_techniques(attack_file: Path) -> List[Dict]:
+    """Techniques from a MITRE ATT&CK dump (a bare list or {"techniques": [...]})."""
+    with open(attack_file, 'rb') as f:
+        if HAS_IJSON and os.fstat(f.fileno()).st_size >= STREAM_PARSE_MIN_BYTES:
+            # Build one technique at a time rather than the whole document tree
+            prefix = "item" if f.read(64).lstrip().startswith(b"[") else "techniques.item"
+            f.seek(0)
+            return list(ijson.items(f, prefix, use_float=True))
+        data = loads(f.read())
+    return data if isinstance(data, list) else data.get("techniques", [])
+
 
 def load_atl_physical() -> List[Dict]:
     """Load ATL-Physical tasks as training documents.
@@ -57,8 +181,7 @@ def load_atl_physical() -> List[Dict]:
         logger.warning(f"ATL-Physical not found at {ATL_PHYSICAL_PATH}")
         return []
 
-    with open(ATL_PHYSICAL_PATH, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
+    data = _load_cached_yaml(ATL_PHYSICAL_PATH, YAML_CACHE_DIR / "atl_physical.json")
 
     documents = []
 
@@ -103,13 +226,70 @@ def load_atl_physical() -> List[Dict]:
     return documents
 
 
+# MITRE tactic -> HD4 phase
+_TACTIC_TO_HD4 = MappingProxyType({
+    "reconnaissance": "HUNT",
+    "resource-development": "HUNT",
+    "initial-access": "DETECT",
+    "execution": "DETECT",
+    "persistence": "DISABLE",
+    "privilege-escalation": "DISABLE",
+    "defense-evasion": "DISRUPT",
+    "credential-access": "DISRUPT",
+    "discovery": "DETECT",
+    "lateral-movement": "DISRUPT",
+    "collection": "DISRUPT",
+    "command-and-control": "DISABLE",
+    "exfiltration": "DOMINATE",
+    "impact": "DOMINATE",
+})
+
+
+# Label mappings for classification (read-only; shared by every instance)
+_TACTIC_LABELS = MappingProxyType({
+    "reconnaissance": 0,
+    "resource-development": 1,
+    "initial-access": 2,
+    "execution": 3,
+    "persistence": 4,
+    "privilege-escalation": 5,
+    "defense-evasion": 6,
+    "credential-access": 7,
+    "discovery": 8,
+    "lateral-movement": 9,
+    "collection": 10,
+    "command-and-control": 11,
+    "exfiltration": 12,
+    "impact": 13,
+})
+
+_HD4_LABELS = MappingProxyType({
+    "HUNT": 0,
+    "DETECT": 1,
+    "DISABLE": 2,
+    "DISRUPT": 3,
+    "DOMINATE": 4,
+})
+
+# Label names indexed by label id, and tactic id -> HD4 id
+_TACTIC_NAMES = tuple(sorted(_TACTIC_LABELS, key=_TACTIC_LABELS.get))
+_HD4_NAMES = tuple(sorted(_HD4_LABELS, key=_HD4_LABELS.get))
+_TACTIC_HD4_IDS = tuple(_HD4_LABELS[_TACTIC_TO_HD4[name]] for name in _TACTIC_NAMES)
+
+
+# Phi-3 system prompts: default, and for ATL-Physical samples
+_PHI3_SYSTEM = "You are a threat intelligence analyst assistant."
+_PHYSICAL_SYSTEM = "You are a physical security threat analyst."
+
+
+# Sample record schemas; generators emit the equivalent dicts directly
 @dataclass
 class Phi3Sample:
     """Phi-3 instruct-tuning sample format."""
     instruction: str
     input: str
     output: str
-    system: str = "You are a threat intelligence analyst assistant."
+    system: str = _PHI3_SYSTEM
 
 
 @dataclass
@@ -129,6 +309,22 @@ class AlpacaSample:
     output: str
 
 
+class Technique(NamedTuple):
+    """MITRE technique fields, looked up and truncated once for every generator."""
+    tech_id: str              # technique_id, falling back to id
+    technique_id: str         # technique_id only (sample metadata)
+    name: str
+    desc1500: str
+    desc1000: str
+    desc800: str
+    desc500: str
+    tactics: List[str]
+    tactic_ids: List[int]     # tactic_labels ids of the known tactics
+    platforms: List[str]
+    detection: str            # truncated to 1000
+    mitigations: List[Any]
+
+
 class LeptoseTrainingPrep:
     """Generate training datasets for Leptose inference engine."""
 
@@ -136,87 +332,95 @@ class LeptoseTrainingPrep:
         self.output_dir = output_dir or OUTPUT_DIR / "training_data"
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Label mappings for classification
-        self.tactic_labels = {
-            "reconnaissance": 0,
-            "resource-development": 1,
-            "initial-access": 2,
-            "execution": 3,
-            "persistence": 4,
-            "privilege-escalation": 5,
-            "defense-evasion": 6,
-            "credential-access": 7,
-            "discovery": 8,
-            "lateral-movement": 9,
-            "collection": 10,
-            "command-and-control": 11,
-            "exfiltration": 12,
-            "impact": 13,
-        }
-
-        self.hd4_labels = {
-            "HUNT": 0,
-            "DETECT": 1,
-            "DISABLE": 2,
-            "DISRUPT": 3,
-            "DOMINATE": 4,
-        }
+        # Label mappings for classification (shared, read-only)
+        self.tactic_labels = _TACTIC_LABELS
+        self.hd4_labels = _HD4_LABELS
 
-    def generate_phi3_samples(self, techniques: List[Dict]) -> List[Dict]:
-        """Generate Phi-3 instruct-tuning samples from techniques."""
-        samples = []
+        # Reverse/derived lookups by label id
+        self.tactic_names = _TACTIC_NAMES
+        self.hd4_names = _HD4_NAMES
+        self.tactic_hd4_ids = _TACTIC_HD4_IDS
 
+    def _normalize_techniques(self, techniques: List[Dict]) -> List[Technique]:
+        """Extract the fields every generator needs in a single pass."""
+        tactic_labels = self.tactic_labels
+        normalized = []
         for tech in techniques:
-            tech_id = tech.get("technique_id") or tech.get("id", "")
-            name = tech.get("name", "")
-            description = tech.get("description", "")[:1500]
+            description = tech.get("description", "")
             tactics = tech.get("tactic", []) or tech.get("tactics", [])
-            platforms = tech.get("platforms", [])
-            detection = tech.get("detection", "")[:1000]
-            mitigations = tech.get("mitigations", [])
+            tactics_norm = [tactic.lower().replace(" ", "-") for tactic in tactics]
+            normalized.append(Technique(
+                tech_id=tech.get("technique_id") or tech.get("id", ""),
+                technique_id=tech.get("technique_id", ""),
+                name=tech.get("name", ""),
+                desc1500=description[:1500],
+                desc1000=description[:1000],
+                desc800=description[:800],
+                desc500=description[:500],
+                tactics=tactics,
+                tactic_ids=[tactic_labels[t] for t in tactics_norm if t in tactic_labels],
+                platforms=tech.get("platforms", []),
+                detection=tech.get("detection", "")[:1000],
+                mitigations=tech.get("mitigations", []),
+            ))
+        return normalized
+
+    def generate_phi3_samples(self, techniques: List[Technique]) -> Iterator[Dict]:
+        """Generate Phi-3 instruct-tuning samples from techniques."""
+        for tech in techniques:
+            tech_id = tech.tech_id
+            name = tech.name
+            description = tech.desc1500
+            tactics = tech.tactics
+            platforms = tech.platforms
+            detection = tech.detection
+            mitigations = tech.mitigations
 
             if not name or not description:
                 continue
 
+            # Joined once, shared by the explanation and classification samples
+            tac_str = ", ".join(tactics) if tactics else "N/A"
+            plat_str = ", ".join(platforms) if platforms else "N/A"
+
             # Sample 1: Technique explanation
-            samples.append(asdict(Phi3Sample(
-                instruction="Explain this MITRE ATT&CK technique and its implications.",
-                input=f"Technique: {tech_id} - {name}",
-                output=f"{description}\n\nTactics: {', '.join(tactics) if tactics else 'N/A'}\nPlatforms: {', '.join(platforms) if platforms else 'N/A'}"
-            )))
+            yield {
+                "instruction": "Explain this MITRE ATT&CK technique and its implications.",
+                "input": f"Technique: {tech_id} - {name}",
+                "output": f"{description}\n\nTactics: {tac_str}\nPlatforms: {plat_str}",
+                "system": _PHI3_SYSTEM
+            }
 
             # Sample 2: Detection guidance
             if detection:
-                samples.append(asdict(Phi3Sample(
-                    instruction="How can this technique be detected?",
-                    input=f"Technique: {tech_id} - {name}",
-                    output=detection
-                )))
+                yield {
+                    "instruction": "How can this technique be detected?",
+                    "input": f"Technique: {tech_id} - {name}",
+                    "output": detection,
+                    "system": _PHI3_SYSTEM
+                }
 
             # Sample 3: Mitigation recommendations
             if mitigations:
                 mit_text = "\n".join([f"- {m.get('name', m) if isinstance(m, dict) else m}" for m in mitigations[:5]])
-                samples.append(asdict(Phi3Sample(
-                    instruction="What mitigations are effective against this technique?",
-                    input=f"Technique: {tech_id} - {name}",
-                    output=f"Recommended mitigations:\n{mit_text}"
-                )))
+                yield {
+                    "instruction": "What mitigations are effective against this technique?",
+                    "input": f"Technique: {tech_id} - {name}",
+                    "output": f"Recommended mitigations:\n{mit_text}",
+                    "system": _PHI3_SYSTEM
+                }
 
             # Sample 4: Tactic classification
             if tactics:
-                samples.append(asdict(Phi3Sample(
-                    instruction="What MITRE ATT&CK tactic does this technique belong to?",
-                    input=f"Technique: {name}\nDescription: {description[:500]}",
-                    output=f"This technique belongs to the following tactics: {', '.join(tactics)}"
-                )))
-
-        logger.info(f"Generated {len(samples)} Phi-3 training samples from techniques")
-        return samples
-
-    def generate_phi3_from_rules(self, rules: List[Dict]) -> List[Dict]:
+                yield {
+                    "instruction": "What MITRE ATT&CK tactic does this technique belong to?",
+                    "input": f"Technique: {name}\nDescription: {description[:500]}",
+                    "output": f"This technique belongs to the following tactics: {tac_str}",
+                    "system": _PHI3_SYSTEM
+                }
+
+    def generate_phi3_from_rules(self, rules: List[Dict]) -> Iterator[Dict]:
         """Generate Phi-3 samples from detection rules."""
-        samples = []
-
         for rule in rules:
             title = rule.get("title", "")
             description = rule.get("description", "")
@@ -238,97 +442,73 @@ class LeptoseTrainingPrep:
                 output_parts.append(f"MITRE ATT&CK: {', '.join(mitre_refs)}")
             output_parts.append(f"Severity: {level}, Status: {status}")
 
-            samples.append(asdict(Phi3Sample(
-                instruction="Explain this detection rule and what it detects.",
-                input=f"Rule: {title}",
-                output="\n".join(output_parts)
-            )))
+            yield {
+                "instruction": "Explain this detection rule and what it detects.",
+                "input": f"Rule: {title}",
+                "output": "\n".join(output_parts),
+                "system": _PHI3_SYSTEM
+            }
 
             # Sample: False positive guidance
             if false_positives:
                 fp_text = "\n".join([f"- {fp}" for fp in false_positives[:5]])
-                samples.append(asdict(Phi3Sample(
-                    instruction="What are the known false positives for this detection rule?",
-                    input=f"Rule: {title}",
-                    output=f"Known false positives:\n{fp_text}"
-                )))
-
-        logger.info(f"Generated {len(samples)} Phi-3 training samples from rules")
-        return samples
-
-    def generate_classification_samples(self, techniques: List[Dict]) -> List[Dict]:
+                yield {
+                    "instruction": "What are the known false positives for this detection rule?",
+                    "input": f"Rule: {title}",
+                    "output": f"Known false positives:\n{fp_text}",
+                    "system": _PHI3_SYSTEM
+                }
+
+    def generate_classification_samples(self, techniques: List[Technique]) -> Iterator[Dict]:
         """Generate DistilBERT classification samples."""
-        samples = []
+        tactic_names = self.tactic_names
 
         for tech in techniques:
-            name = tech.get("name", "")
-            description = tech.get("description", "")[:500]
-            tactics = tech.get("tactic", []) or tech.get("tactics", [])
+            name = tech.name
+            description = tech.desc500
 
-            if not name or not tactics:
+            if not name or not tech.tactics:
                 continue
 
             text = f"{name}. {description}"
 
             # Multi-label: create sample for each tactic
-            for tactic in tactics:
-                tactic_norm = tactic.lower().replace(" ", "-")
-                if tactic_norm in self.tactic_labels:
-                    samples.append(asdict(ClassificationSample(
-                        text=text,
-                        label=tactic_norm,
-                        label_id=self.tactic_labels[tactic_norm],
-                        metadata={"technique_id": tech.get("technique_id", "")}
-                    )))
-
-        logger.info(f"Generated {len(samples)} classification samples")
-        return samples
-
-    def generate_hd4_samples(self, techniques: List[Dict], rules: List[Dict]) -> List[Dict]:
+            for label_id in tech.tactic_ids:
+                yield {
+                    "text": text,
+                    "label": tactic_names[label_id],
+                    "label_id": label_id,
+                    "metadata": {"technique_id": tech.technique_id}
+                }
+
+    def generate_hd4_samples(self, techniques: List[Technique], rules: List[Dict]) -> Iterator[Dict]:
         """Generate HD4 phase classification samples."""
-        samples = []
-
-        # Map tactics to HD4 phases
-        tactic_to_hd4 = {
-            "reconnaissance": "HUNT",
-            "resource-development": "HUNT",
-            "initial-access": "DETECT",
-            "execution": "DETECT",
-            "persistence": "DISABLE",
-            "privilege-escalation": "DISABLE",
-            "defense-evasion": "DISRUPT",
-            "credential-access": "DISRUPT",
-            "discovery": "DETECT",
-            "lateral-movement": "DISRUPT",
-            "collection": "DISRUPT",
-            "command-and-control": "DISABLE",
-            "exfiltration": "DOMINATE",
-            "impact": "DOMINATE",
-        }
+        # HD4 phase names indexed by label id, for walking the per-technique bitmask
+        hd4_names = self.hd4_names
+        tactic_hd4_ids = self.tactic_hd4_ids
+        detect_id = self.hd4_labels["DETECT"]
 
         for tech in techniques:
-            name = tech.get("name", "")
-            description = tech.get("description", "")[:500]
-            tactics = tech.get("tactic", []) or tech.get("tactics", [])
+            name = tech.name
+            description = tech.desc500
 
-            if not name or not tactics:
+            if not name or not tech.tactics:
                 continue
 
-            # Determine primary HD4 phase
-            hd4_phases = set()
-            for tactic in tactics:
-                tactic_norm = tactic.lower().replace(" ", "-")
-                if tactic_norm in tactic_to_hd4:
-                    hd4_phases.add(tactic_to_hd4[tactic_norm])
-
-            for phase in hd4_phases:
-                text = f"{name}. {description}"
-                samples.append(asdict(ClassificationSample(
-                    text=text,
-                    label=phase,
-                    label_id=self.hd4_labels[phase],
-                    metadata={"technique_id": tech.get("technique_id", ""), "source": "technique"}
-                )))
+            # Determine primary HD4 phases as a bitmask over label ids
+            seen = 0
+            for tactic_id in tech.tactic_ids:
+                seen |= 1 << tactic_hd4_ids[tactic_id]
+
+            text = f"{name}. {description}"
+            for label_id, phase in enumerate(hd4_names):
+                if seen >> label_id & 1:
+                    yield {
+                        "text": text,
+                        "label": phase,
+                        "label_id": label_id,
+                        "metadata": {"technique_id": tech.technique_id, "source": "technique"}
+                    }
 
         # Detection rules → DETECT phase
         for rule in rules:
@@ -339,58 +519,52 @@ class LeptoseTrainingPrep:
                 continue
 
             text = f"{title}. {description}"
-            samples.append(asdict(ClassificationSample(
-                text=text,
-                label="DETECT",
-                label_id=self.hd4_labels["DETECT"],
-                metadata={"rule_id": rule.get("id", ""), "source": "detection_rule"}
-            )))
-
-        logger.info(f"Generated {len(samples)} HD4 classification samples")
-        return samples
+            yield {
+                "text": text,
+                "label": "DETECT",
+                "label_id": detect_id,
+                "metadata": {"rule_id": rule.get("id", ""), "source": "detection_rule"}
+            }
 
-    def generate_alpaca_samples(self, techniques: List[Dict], rules: List[Dict]) -> List[Dict]:
+    def generate_alpaca_samples(self, techniques: List[Technique], rules: List[Dict]) -> Iterator[Dict]:
         """Generate Alpaca-format instruction samples."""
-        samples = []
-
-        # Technique-based samples
-        for tech in techniques:
-            tech_id = tech.get("technique_id") or tech.get("id", "")
-            name = tech.get("name", "")
-            description = tech.get("description", "")[:1000]
-
-            if not name:
-                continue
-
-            samples.append(asdict(AlpacaSample(
-                instruction="Describe this cybersecurity attack technique.",
-                input=name,
-                output=f"{tech_id}: {description}"
-            )))
-
-        # Q&A style samples
+        # Q&A style templates
         qa_templates = [
             ("What is {name}?", "{description}"),
             ("How does the {name} attack work?", "{description}"),
             ("Explain the {name} technique used by attackers.", "{description}"),
         ]
 
-        for tech in random.sample(techniques, min(100, len(techniques))):
-            name = tech.get("name", "")
-            description = tech.get("description", "")[:800]
+        # Up to 100 techniques also get a Q&A sample; pick them and their
+        # templates up front (in sample order, so seeded runs draw the same
+        # random stream as before) and emit both kinds in one pass
+        n = len(techniques)
+        qa_picks = {}
+        for i in random.sample(range(n), min(100, n)):
+            tech = techniques[i]
+            if tech.name and tech.desc800:
+                qa_picks[i] = random.choice(qa_templates)
 
-            if not name or not description:
+        for i, tech in enumerate(techniques):
+            name = tech.name
+
+            if not name:
                 continue
 
-            template = random.choice(qa_templates)
-            samples.append(asdict(AlpacaSample(
-                instruction=template[0].format(name=name),
-                input="",
-                output=template[1].format(description=description)
-            )))
+            # Technique-based sample
+            yield {
+                "instruction": "Describe this cybersecurity attack technique.",
+                "input": name,
+                "output": f"{tech.tech_id}: {tech.desc1000}"
+            }
 
-        logger.info(f"Generated {len(samples)} Alpaca-format samples")
-        return samples
+            template = qa_picks.get(i)
+            if template is not None:
+                yield {
+                    "instruction": template[0].format(name=name),
+                    "input": "",
+                    "output": template[1].format(description=tech.desc800)
+                }
 
     def generate_atl_physical_samples(self, atl_docs: List[Dict]) -> Dict[str, List]:
         """Generate training samples from ATL-Physical documents.
@@ -401,6 +575,10 @@ class LeptoseTrainingPrep:
         phi3_samples = []
         hd4_samples = []
         alpaca_samples = []
+        phi3_append = phi3_samples.append
+        hd4_append = hd4_samples.append
+        alpaca_append = alpaca_samples.append
+        hd4_labels = self.hd4_labels
 
         for doc in atl_docs:
             if doc.get('type') != 'adversary_task':
@@ -418,52 +596,52 @@ class LeptoseTrainingPrep:
                 continue
 
             # Phi-3 instruction samples
-            phi3_samples.append(asdict(Phi3Sample(
-                instruction="Describe this adversary task in the physical threat domain.",
-                input=f"Task {task_id} ({modality})",
-                output=text,
-                system="You are a physical security threat analyst."
-            )))
+            phi3_append({
+                "instruction": "Describe this adversary task in the physical threat domain.",
+                "input": f"Task {task_id} ({modality})",
+                "output": text,
+                "system": _PHYSICAL_SYSTEM
+            })
 
             # Phase-specific instruction
             if phase > 0:
-                phi3_samples.append(asdict(Phi3Sample(
-                    instruction=f"What happens in phase {phase} of adversary operations?",
-                    input=f"Task: {task_id}",
-                    output=text,
-                    system="You are a physical security threat analyst."
-                )))
+                phi3_append({
+                    "instruction": f"What happens in phase {phase} of adversary operations?",
+                    "input": f"Task: {task_id}",
+                    "output": text,
+                    "system": _PHYSICAL_SYSTEM
+                })
 
             # Interdiction point guidance
             if is_interdiction:
-                phi3_samples.append(asdict(Phi3Sample(
-                    instruction="Identify interdiction opportunities for this adversary task.",
-                    input=f"Task {task_id}: {text[:200]}",
-                    output=f"This task ({task_id}) is an interdiction point. Early detection at this stage can disrupt the adversary's operational timeline.",
-                    system="You are a physical security threat analyst."
-                )))
+                phi3_append({
+                    "instruction": "Identify interdiction opportunities for this adversary task.",
+                    "input": f"Task {task_id}: {text[:200]}",
+                    "output": f"This task ({task_id}) is an interdiction point. Early detection at this stage can disrupt the adversary's operational timeline.",
+                    "system": _PHYSICAL_SYSTEM
+                })
 
             # HD4 classification samples
             for hd4_phase in hd4_phases:
-                if hd4_phase in self.hd4_labels:
-                    hd4_samples.append(asdict(ClassificationSample(
-                        text=text,
-                        label=hd4_phase,
-                        label_id=self.hd4_labels[hd4_phase],
-                        metadata={
+                if hd4_phase in hd4_labels:
+                    hd4_append({
+                        "text": text,
+                        "label": hd4_phase,
+                        "label_id": hd4_labels[hd4_phase],
+                        "metadata": {
                             'task_id': task_id,
                             'source': 'ATL-Physical',
                             'domain': 'physical',
                             'modality': modality,
                         }
-                    )))
+                    })
 
             # Alpaca samples
-            alpaca_samples.append(asdict(AlpacaSample(
-                instruction="Explain this physical domain adversary task.",
-                input=f"Task {task_id}",
-                output=text
-            )))
+            alpaca_append({
+                "instruction": "Explain this physical domain adversary task.",
+                "input": f"Task {task_id}",
+                "output": text
+            })
 
         logger.info(f"[ATL-Physical] Generated {len(phi3_samples)} Phi-3, {len(hd4_samples)} HD4, {len(alpaca_samples)} Alpaca samples")
 
@@ -473,15 +651,12 @@ class LeptoseTrainingPrep:
             'alpaca': alpaca_samples,
         }
 
-    def process_threat_content(self, content_dir: Path) -> Dict[str, List]:
-        """Process all threat content and generate training data."""
-        results = {
-            "phi3": [],
-            "classification": [],
-            "hd4": [],
-            "alpaca": [],
-        }
+    def process_threat_content(self, content_dir: Path) -> Dict[str, Iterable[Dict]]:
+        """Process all threat content into lazy per-dataset sample streams.
 
+        Samples are generated as save_datasets writes them, so no dataset is
+        held in memory as a whole (the techniques and rules themselves are).
+        """
         techniques = []
         rules = []
 
@@ -489,95 +664,69 @@ class LeptoseTrainingPrep:
         attack_file = content_dir / "mitre_attack.json"
         if attack_file.exists():
             logger.info(f"Loading techniques from {attack_file}")
-            with open(attack_file) as f:
-                data = json.load(f)
-                techniques = data if isinstance(data, list) else data.get("techniques", [])
-                logger.info(f"Loaded {len(techniques)} techniques")
+            techniques = _load_techniques(attack_file)
+            logger.info(f"Loaded {len(techniques)} techniques")
 
         # Load rules (simplified - just load metadata)
         rules_dir = content_dir / "sigma_rules"
         if rules_dir.exists():
             logger.info(f"Loading rules from {rules_dir}")
-            try:
-                import yaml
-                for rule_file in rules_dir.glob("**/*.yml"):
-                    try:
-                        with open(rule_file) as f:
-                            rule = yaml.safe_load(f)
-                            if rule:
-                                rules.append(rule)
-                    except:
-                        continue
+            if HAS_YAML:
+                rules = _load_cached_rules(rules_dir)
                 logger.info(f"Loaded {len(rules)} rules")
-            except ImportError:
+            else:
                 logger.warning("PyYAML not installed, skipping rule loading")
 
-        # Generate training samples from cyber threat content
-        results["phi3"] = self.generate_phi3_samples(techniques)
-        results["phi3"].extend(self.generate_phi3_from_rules(rules))
-        results["classification"] = self.generate_classification_samples(techniques)
-        results["hd4"] = self.generate_hd4_samples(techniques, rules)
-        results["alpaca"] = self.generate_alpaca_samples(techniques, rules)
-
         # ATL sources (invisible operationally, included in training)
+        atl_samples = {}
         atl_physical_docs = load_atl_physical()
         if atl_physical_docs:
             atl_samples = self.generate_atl_physical_samples(atl_physical_docs)
-            results["phi3"].extend(atl_samples.get('phi3', []))
-            results["hd4"].extend(atl_samples.get('hd4', []))
-            results["alpaca"].extend(atl_samples.get('alpaca', []))
         # Future: load_atl_cyber(), load_atl_wmd() (reserved)
 
-        return results
-
-    def save_datasets(self, data: Dict[str, List]):
-        """Save all training datasets to files."""
-        # Phi-3 LoRA format (JSONL)
-        phi3_file = self.output_dir / "phi3_lora_training.jsonl"
-        with open(phi3_file, "w") as f:
-            for sample in data["phi3"]:
-                f.write(json.dumps(sample) + "\n")
-        logger.info(f"Saved {len(data['phi3'])} samples to {phi3_file}")
-
-        # DistilBERT classification (JSONL)
-        class_file = self.output_dir / "distilbert_classification.jsonl"
-        with open(class_file, "w") as f:
-            for sample in data["classification"]:
-                f.write(json.dumps(sample) + "\n")
-        logger.info(f"Saved {len(data['classification'])} samples to {class_file}")
-
-        # HD4 classification (JSONL)
-        hd4_file = self.output_dir / "hd4_classification.jsonl"
-        with open(hd4_file, "w") as f:
-            for sample in data["hd4"]:
-                f.write(json.dumps(sample) + "\n")
-        logger.info(f"Saved {len(data['hd4'])} samples to {hd4_file}")
-
-        # Alpaca format (JSON)
-        alpaca_file = self.output_dir / "alpaca_format.json"
-        with open(alpaca_file, "w") as f:
-            json.dump(data["alpaca"], f, indent=2)
-        logger.info(f"Saved {len(data['alpaca'])} samples to {alpaca_file}")
+        # Chain the cyber threat content generators with the ATL samples
+        techs = self._normalize_techniques(techniques)
+        return {
+            "phi3": chain(self.generate_phi3_samples(techs),
+                          self.generate_phi3_from_rules(rules),
+                          atl_samples.get('phi3', [])),
+            "classification": self.generate_classification_samples(techs),
+            "hd4": chain(self.generate_hd4_samples(techs, rules), atl_samples.get('hd4', [])),
+            "alpaca": chain(self.generate_alpaca_samples(techs, rules), atl_samples.get('alpaca', [])),
+        }
+
+    def save_datasets(self, data: Dict[str, Iterable[Dict]]):
+        """Save the given training datasets to files, consuming each stream once."""
+        summary = {}
+
+        # Phi-3 LoRA format, DistilBERT and HD4 classification (JSONL)
+        for key, filename in (("phi3", "phi3_lora_training.jsonl"),
+                              ("classification", "distilbert_classification.jsonl"),
+                              ("hd4", "hd4_classification.jsonl")):
+            if key in data:
+                path = self.output_dir / filename
+                summary[f"{key}_samples"] = count = _write_jsonl(path, data[key])
+                logger.info(f"Saved {count} samples to {path}")
+
+        # Alpaca format (JSON array, so materialized)
+        if "alpaca" in data:
+            alpaca = list(data["alpaca"])
+            alpaca_file = self.output_dir / "alpaca_format.json"
+            write_json_file(alpaca_file, alpaca)
+            summary["alpaca_samples"] = len(alpaca)
+            logger.info(f"Saved {len(alpaca)} samples to {alpaca_file}")
 
         # Save label mappings
         labels_file = self.output_dir / "label_mappings.json"
-        with open(labels_file, "w") as f:
-            json.dump({
-                "tactic_labels": self.tactic_labels,
-                "hd4_labels": self.hd4_labels,
-            }, f, indent=2)
+        write_json_file(labels_file, {
+            "tactic_labels": dict(self.tactic_labels),
+            "hd4_labels": dict(self.hd4_labels),
+        })
 
         # Summary
-        summary = {
-            "phi3_samples": len(data["phi3"]),
-            "classification_samples": len(data["classification"]),
-            "hd4_samples": len(data["hd4"]),
-            "alpaca_samples": len(data["alpaca"]),
-            "output_dir": str(self.output_dir),
-        }
+        summary["output_dir"] = str(self.output_dir)
         summary_file = self.output_dir / "training_summary.json"
-        with open(summary_file, "w") as f:
-            json.dump(summary, f, indent=2)
+        write_json_file(summary_file, summary)
 
         return summary
 
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Async rate limiting shared by the interview generators
+"""
+
+import asyncio
+
+
+class AsyncRateLimiter:
+    """Token-bucket pacer: admits at most rate_per_sec request starts per second."""
+
+    def __init__(self, rate_per_sec: float):
+        self.interval = 1.0 / rate_per_sec
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return self
+
+    async def __aexit__(self, *exc):
+        return False